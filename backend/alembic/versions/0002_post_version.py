@@ -0,0 +1,30 @@
+"""add posts.version for optimistic concurrency control
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant server default makes this a metadata-only change on Postgres 11+
+    op.add_column(
+        'posts',
+        sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'version')
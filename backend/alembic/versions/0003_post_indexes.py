@@ -0,0 +1,45 @@
+"""indexes for the feed, author and recency queries on posts
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_posts_created_at_id', ['created_at', 'id']),
+    ('ix_posts_author_id', ['author_id']),
+    ('ix_posts_updated_at', ['updated_at']),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps posts writable during the build but cannot run in a
+    # transaction; other dialects ignore the flag. If a build fails, drop the
+    # INVALID index it leaves behind before upgrading again.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, 'posts', columns,
+                if_not_exists=True, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name='posts',
+                if_exists=True, postgresql_concurrently=True
+            )
@@ -0,0 +1,43 @@
+"""composite index for per-author post timelines
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composite index leads with author_id, so it replaces ix_posts_author_id
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_author_id_created_at_id', 'posts', ['author_id', 'created_at', 'id'],
+            if_not_exists=True, postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_posts_author_id', table_name='posts',
+            if_exists=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_author_id', 'posts', ['author_id'],
+            if_not_exists=True, postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_posts_author_id_created_at_id', table_name='posts',
+            if_exists=True, postgresql_concurrently=True
+        )
@@ -0,0 +1,47 @@
+"""full-text search column and GIN index on posts
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Other backends search with the in-process index (app/core/search.py)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Adding a stored generated column rewrites posts under an exclusive lock
+    op.execute(
+        "ALTER TABLE posts ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', description)) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_search_vector', 'posts', ['search_vector'],
+            postgresql_using='gin', if_not_exists=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_posts_search_vector', table_name='posts',
+            if_exists=True, postgresql_concurrently=True
+        )
+    op.drop_column('posts', 'search_vector')
@@ -8,9 +8,10 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_config
-from app.core.database import get_db
-from app.repositories.user import UserRepository
-from app.models.user import User
+from app.core.database import get_read_db, get_write_db
+from app.core.tokens import access_tokens
+from app.schemas.user import UserSummary
+from app.services.user import UserService
 
 config = get_config()
 security = HTTPBearer()
@@ -26,20 +27,14 @@ class AuthenticationError(HTTPException):
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+def _authenticate(credentials: HTTPAuthorizationCredentials) -> int:
+    """Verify the bearer token and return the user ID it was issued to"""
     try:
         # Extract token from credentials
         token = credentials.credentials
         
-        # Decode JWT token
-        payload = jwt.decode(
-            token, 
-            config.jwt.secret_key, 
-            algorithms=[config.jwt.algorithm]
-        )
+        # Decode JWT token (memoized until the token expires)
+        payload = access_tokens.decode(token)
         
         # Extract user ID from token payload
         user_id: str = payload.get("sub")
@@ -48,22 +43,67 @@ async def get_current_user(
             
         # Convert user_id to integer
         try:
-            user_id_int = int(user_id)
+            return int(user_id)
         except ValueError:
             raise AuthenticationError("Invalid user ID in token")
         
+    except AuthenticationError:
+        raise
     except jwt.ExpiredSignatureError:
         raise AuthenticationError("Token has expired")
     except jwt.InvalidTokenError:
         raise AuthenticationError("Invalid token")
     except Exception:
         raise AuthenticationError("Could not validate credentials")
-    
-    # Get user from database
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id_int)
-    
+
+
+async def _load_principal(user_id: int, db: AsyncSession) -> UserSummary:
+    # Get user from the principal cache or database
+    user = await UserService(db).get_principal(user_id)
     if user is None:
         raise AuthenticationError("User not found")
-        
     return user
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db)
+) -> UserSummary:
+    user_id = _authenticate(credentials)
+    try:
+        return await _load_principal(user_id, db)
+    finally:
+        # Return the connection now rather than after the response
+        await db.close()
+
+
+async def get_current_writer(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_write_db)
+) -> UserSummary:
+    """get_current_user for routes on get_write_db, loading the principal on the route's own session"""
+    return await _load_principal(_authenticate(credentials), db)
+
+
+def _admin(user: UserSummary) -> UserSummary:
+    """Allow only users listed in AUTH_ADMIN_EMAILS"""
+    if user.email not in config.auth.admin_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required"
+        )
+    return user
+
+
+async def require_admin(
+    current_user: UserSummary = Depends(get_current_user)
+) -> UserSummary:
+    """Administrators only, for read routes"""
+    return _admin(current_user)
+
+
+async def require_admin_writer(
+    current_user: UserSummary = Depends(get_current_writer)
+) -> UserSummary:
+    """Administrators only, for routes on get_write_db"""
+    return _admin(current_user)
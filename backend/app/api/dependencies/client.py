@@ -0,0 +1,23 @@
+"""
+Client identification dependencies for FastAPI routes.
+"""
+from typing import Optional
+from fastapi import Request
+
+from app.core.config import get_config
+
+config = get_config()
+
+
+def get_client_ip(request: Request) -> Optional[str]:
+    """Get the client address, honouring X-Forwarded-For only from trusted proxies"""
+    peer = request.client.host if request.client else None
+
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded and peer in config.server.trusted_proxies:
+        # The right-most address not belonging to a trusted proxy is the client
+        for address in reversed([part.strip() for part in forwarded.split(",")]):
+            if address and address not in config.server.trusted_proxies:
+                return address
+
+    return peer
@@ -0,0 +1,125 @@
+"""
+ASGI middleware.
+"""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_config
+from app.core.database import READ_YOUR_WRITES_COOKIE
+from app.core.metrics import UNMATCHED_ROUTE, request_metrics
+from app.core.profiling import current_profile, finish_profile, start_profile
+
+config = get_config()
+
+
+class ReadYourWritesMiddleware:
+    """Pin clients that just wrote to the primary for DB_READ_YOUR_WRITES_WINDOW seconds
+
+    Requests using get_write_db flag themselves in the request state; their
+    responses set a short-lived cookie that makes get_read_db skip replicas,
+    so a client reads its own writes even while the replicas catch up.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.cookie = (
+            f"{READ_YOUR_WRITES_COOKIE}=1; Max-Age={config.database.read_your_writes_window}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not config.database.replica_urls:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.get("db_wrote"):
+                MutableHeaders(scope=message).append("set-cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+class MetricsMiddleware:
+    """Record latency, status and body sizes of every HTTP request per route template
+
+    Add it last so it is outermost and its timings include the other middleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_counted() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_counted(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        request_metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_counted, send_counted)
+        finally:
+            elapsed = time.perf_counter() - start
+            request_metrics.in_flight -= 1
+            # The router leaves the matched route in the scope; label by its template, not the raw path
+            route = scope.get("route")
+            path = getattr(route, "path_format", None) or UNMATCHED_ROUTE
+            request_metrics.route(scope["method"], path).observe(
+                status, elapsed, request_bytes, response_bytes
+            )
+
+
+class QueryProfilerMiddleware:
+    """Profile the SQL queries of a sampled share of requests
+
+    Likely N+1 patterns are logged when the request finishes; with
+    PROFILER_SERVER_TIMING the response also carries the request's DB time
+    up to the moment its headers were sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_profile()
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and config.profiler.server_timing:
+                MutableHeaders(scope=message).append("server-timing", current_profile().server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = getattr(scope.get("route"), "path_format", None) or scope["path"]
+            finish_profile(token, f"{scope['method']} {route}")
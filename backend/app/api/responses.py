@@ -0,0 +1,105 @@
+"""
+Fast JSON responses for already-validated Pydantic models.
+
+With `response_model` set, FastAPI dumps whatever an endpoint returns to
+Python objects, validates them against the model again, and then encodes
+them to JSON. When the service layer already hands back the response model,
+all of that is repeated work. Routes decorated with `fast_json` return a
+`ModelJSONResponse` instead, which writes bytes straight from a precompiled
+TypeAdapter; FastAPI passes Response objects through untouched.
+
+Keep `response_model` on the route for the OpenAPI schema:
+
+    @router.post("/posts", response_model=PostResponse)
+    @fast_json(PostResponse)
+    async def create_post(...):
+        ...
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import lru_cache, wraps
+from typing import Any, Optional, get_args, get_origin
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from app.core.config import get_config
+
+config = get_config()
+
+
+@lru_cache(maxsize=None)
+def serializer_for(type_: Any) -> TypeAdapter:
+    """Build (once per type) the TypeAdapter used to validate and serialize `type_`"""
+    return TypeAdapter(type_)
+
+
+class ModelJSONResponse(Response):
+    """JSON response rendered by the TypeAdapter of the declared type"""
+    media_type = "application/json"
+
+    def __init__(self, content: Any, type_: Any, status_code: int = 200, **kwargs):
+        self.serializer = serializer_for(type_)
+        self.type_ = type_
+        super().__init__(content, status_code=status_code, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if not _is_instance(content, self.type_):
+            # Dicts or ORM objects still go through validation, as response_model would
+            content = self.serializer.validate_python(content, from_attributes=True)
+        return self.serializer.dump_json(content, by_alias=True)
+
+
+def _is_instance(content: Any, type_: Any) -> bool:
+    """Whether `content` is already a `type_`, looking into List[Model] element types"""
+    if isinstance(type_, type):
+        return isinstance(content, type_)
+    if get_origin(type_) is list and isinstance(content, list):
+        (item_type,) = get_args(type_)
+        return isinstance(item_type, type) and all(isinstance(item, item_type) for item in content)
+    return False
+
+
+def fast_json(type_: Any, status_code: Optional[int] = None):
+    """Serialize the endpoint's return value with ModelJSONResponse
+
+    Disabled globally by SERVER_FAST_SERIALIZATION=false, which falls back to
+    FastAPI's response_model handling.
+    """
+    def decorator(endpoint):
+        if not config.server.fast_serialization:
+            return endpoint
+
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            if status_code is None:
+                return ModelJSONResponse(result, type_)
+            return ModelJSONResponse(result, type_, status_code=status_code)
+
+        return wrapper
+
+    return decorator
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag` (weak comparison, as RFC 9110 asks for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque_tag(tag) == _opaque_tag(etag) for tag in if_none_match.split(","))
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC (or aware) datetime as an HTTP-date"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
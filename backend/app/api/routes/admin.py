@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_write_db
+from app.core.hashing import HashingBusyError
+from app.api.dependencies.auth import require_admin_writer
+from app.schemas.bulk_import import ImportReport
+from app.schemas.user import UserSummary
+from app.services.bulk_import import BulkImportService, parse_records
+
+router = APIRouter()
+
+CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+def _import_format(request: Request) -> str:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = CONTENT_TYPES.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send one of: {', '.join(CONTENT_TYPES)}"
+        )
+    return fmt
+
+
+@router.post("/import/users", response_model=ImportReport)
+async def import_users(
+    request: Request,
+    db: AsyncSession = Depends(get_write_db),
+    admin: UserSummary = Depends(require_admin_writer)
+):
+    """Bulk import users from an NDJSON or CSV request body"""
+    records = parse_records(request.stream(), _import_format(request))
+    try:
+        return await BulkImportService(db).import_users(records)
+    except HashingBusyError:
+        # Chunks loaded so far stay committed; a retry rejects them as existing emails
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+@router.post("/import/posts", response_model=ImportReport)
+async def import_posts(
+    request: Request,
+    db: AsyncSession = Depends(get_write_db),
+    admin: UserSummary = Depends(require_admin_writer)
+):
+    """Bulk import posts from an NDJSON or CSV request body"""
+    records = parse_records(request.stream(), _import_format(request))
+    return await BulkImportService(db).import_posts(records)
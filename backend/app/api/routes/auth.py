@@ -2,8 +2,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from app.core.database import get_db
+from app.core.database import get_read_db, get_write_db
+from app.api.responses import fast_json
+from app.api.dependencies.client import get_client_ip
 from app.core.config import get_config
+from app.core.tokens import refresh_tokens
+from typing import Optional
 from app.schemas.user import (
     UserCreate, UserResponse, LoginResponse, LoginRequest, RefreshTokenRequest, TokenResponse
 )
@@ -16,15 +20,18 @@ router = APIRouter()
 config = get_config()
 
 @router.post("/signup", response_model=UserResponse)
+@fast_json(UserResponse)
 async def signup_user(
     user_data: UserCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Signup a new user"""
     try:
         user_service = UserService(db)
         return await user_service.create_user(user_data)
         
+    except HTTPException:
+        raise
     except Exception as e:        
         if "already exists" in str(e):
             raise HTTPException(
@@ -38,15 +45,19 @@ async def signup_user(
             )
         
 @router.post("/login", response_model=LoginResponse)
+@fast_json(LoginResponse)
 async def login_user(
     login_data: LoginRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db),
+    client_ip: Optional[str] = Depends(get_client_ip)
 ):
     """Login a new user"""
     try:
         user_service = UserService(db)
-        return await user_service.login(login_data)
+        return await user_service.login(login_data, client_ip)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"fail to login {e}")
         raise HTTPException(
@@ -57,15 +68,11 @@ async def login_user(
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     refresh_data: RefreshTokenRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     try:
         # Decode refresh token
-        payload = jwt.decode(
-            refresh_data.refresh_token, 
-            config.jwt.refresh_secret, 
-            algorithms=[config.jwt.algorithm]
-        )
+        payload = refresh_tokens.decode(refresh_data.refresh_token)
         
         user_id = payload.get("sub")
         token_type = payload.get("type")
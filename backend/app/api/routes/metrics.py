@@ -0,0 +1,87 @@
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.api.dependencies.auth import require_admin
+from app.core.cache import get_caches
+from app.core.config import get_config
+from app.core.database import db_manager
+from app.core.hashing import LATENCY_BUCKETS, password_hasher
+from app.core.metrics import render_prometheus, request_metrics
+from app.core.pool import InstrumentedPool
+from app.core.statement_cache import statement_cache_snapshot
+from app.services.post import feed_broker
+
+router = APIRouter()
+
+config = get_config()
+
+# The JSON breakdowns name database hosts and carry raw connection errors;
+# only the Prometheus scrape endpoint is open (firewall it or leave metrics off)
+admin_only = [Depends(require_admin)]
+
+
+@router.get("", response_class=Response)
+async def get_prometheus_metrics():
+    """Per-route request metrics in the Prometheus text format, across all workers"""
+    if not config.metrics.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return Response(
+        render_prometheus(*request_metrics.collect()),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@router.get("/cache", dependencies=admin_only)
+async def get_cache_metrics():
+    """Hit/miss counters for every in-process cache of this worker"""
+    return {
+        name: {**asdict(stats), "hit_ratio": stats.hit_ratio}
+        for name, stats in ((name, cache.stats()) for name, cache in get_caches().items())
+    }
+
+
+@router.get("/hashing", dependencies=admin_only)
+async def get_hashing_metrics():
+    """Latency and saturation of the password hashing pool of this worker"""
+    stats = password_hasher.stats()
+    return {
+        **asdict(stats),
+        "latency_buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], stats.latency_buckets)),
+        "max_workers": password_hasher.max_workers,
+        "max_pending": password_hasher.max_pending,
+    }
+
+
+@router.get("/replicas", dependencies=admin_only)
+async def get_replica_metrics():
+    """Health and lag of each read replica as last seen by this worker"""
+    return [
+        {"name": replica.name, "healthy": replica.healthy, "lag": replica.lag, "error": replica.error}
+        for replica in db_manager.replicas
+    ]
+
+
+@router.get("/pool", dependencies=admin_only)
+async def get_pool_metrics():
+    """Connection pool gauges, checkout waits, timeouts and pre-ping failures per engine"""
+    return {
+        name: engine.pool.snapshot()
+        for name, engine in db_manager.engines().items()
+        if isinstance(engine.pool, InstrumentedPool)
+    }
+
+
+@router.get("/statements", dependencies=admin_only)
+async def get_statement_cache_metrics():
+    """Compiled statement cache hits, misses and sizes per engine"""
+    return {
+        name: snapshot
+        for name, snapshot in ((name, statement_cache_snapshot(engine)) for name, engine in db_manager.engines().items())
+        if snapshot is not None
+    }
+
+
+@router.get("/events", dependencies=admin_only)
+async def get_event_metrics():
+    """Feed event subscribers and fan-out of this worker"""
+    return asdict(feed_broker.stats())
@@ -1,23 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.schemas.post import PostResponse, CreatePost, EditPost
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
+from app.schemas.post import PostResponse, CreatePost, EditPost, PostPage, PostSearchPage
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.services.post import PostService
-from app.api.dependencies.auth import get_current_user
-from app.models.user import User
-from typing import List
+from app.core.config import get_config
+from app.core.database import get_read_db, get_write_db
+from app.api.responses import etag_matches, fast_json, http_date
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from app.services.post import PostService, feed_broker, feed_version
+from app.repositories.post import PostNotFoundError, PostVersionConflictError
+from app.api.dependencies.auth import get_current_writer
+from app.schemas.user import UserSummary
+from typing import AsyncIterator, List, Optional
 
 router = APIRouter()
 
+config = get_config()
 
-@router.get("/posts", response_model=List[PostResponse])
-async def get_all_posts(
-    db: AsyncSession = Depends(get_db)
+
+@router.get("/posts", response_model=PostPage, responses={304: {"description": "Page unchanged"}})
+async def get_posts(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
+    """Get a page of the feed; polling clients revalidate it with If-None-Match"""
+    # no-cache: clients may keep the page but must revalidate before reusing it
+    headers = {"ETag": feed_version.etag(limit, cursor), "Cache-Control": "no-cache"}
+    # Answered from the feed version alone, without a query
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
     try:
         post_service = PostService(db)
-        return await post_service.get_all_posts()
+        page = await post_service.get_posts_page_json(limit, cursor)
+        if page.last_modified is not None:
+            headers["Last-Modified"] = http_date(page.last_modified)
+        return Response(content=page.body, media_type="application/json", headers=headers)
     
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         print(f"Error fetching posts: {e}")
         raise HTTPException(
@@ -26,15 +51,84 @@ async def get_all_posts(
         )
 
 
+@router.get("/posts/search", response_model=PostSearchPage)
+@fast_json(PostSearchPage)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Search post descriptions, best match first"""
+    try:
+        post_service = PostService(db)
+        return await post_service.search_posts(q, limit, cursor)
+    
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        print(f"Error searching posts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            detail="Failed to search posts"
+        )
+
+
+@router.get(
+    "/posts/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def stream_posts(
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Stream the whole feed as newline-delimited JSON"""
+    post_service = PostService(db)
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        async for post in post_service.stream_posts():
+            yield post.model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/posts/events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}, 503: {"description": "Too many subscribers"}},
+)
+async def post_events(last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events for new and edited posts, instead of polling /posts
+
+    Events: `post_created` and `post_edited` carry the post; `resync` asks the
+    client to refetch the feed, e.g. after it fell behind.
+    """
+    if not config.events.enabled or feed_broker.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Feed events are unavailable"
+        )
+    return StreamingResponse(
+        feed_broker.stream(last_event_id),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: keep nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/posts", response_model=PostResponse)
+@fast_json(PostResponse)
 async def create_post(
     post_data: CreatePost,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_write_db),
+    current_user: UserSummary = Depends(get_current_writer)
 ):
     try:
         post_service = PostService(db)
-        return await post_service.create_post(post_data, current_user.id)
+        return await post_service.create_post(post_data, current_user)
     
     except Exception as e:
         print(f"Error creating post: {e}")
@@ -44,15 +138,22 @@ async def create_post(
             )
     
 @router.put("/posts/{post_id}", response_model=PostResponse)
+@fast_json(PostResponse)
 async def edit_post(
     post_id: int,
     post_data: EditPost,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_write_db),
+    current_user: UserSummary = Depends(get_current_writer)
 ):
     try:
         post_service = PostService(db)
-        return await post_service.edit_post(post_id, post_data, current_user.id)
+        return await post_service.edit_post(post_id, post_data, current_user)
+    except PostNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except PostVersionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         print(f"Error editing post: {e}")
         raise HTTPException(
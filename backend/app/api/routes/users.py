@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.database import get_read_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from app.api.responses import fast_json
+from app.schemas.post import AuthorPostPage
+from app.services.post import PostService
+from app.services.user import UserService
+
+router = APIRouter()
+
+
+@router.get("/{user_id}/posts", response_model=AuthorPostPage)
+@fast_json(AuthorPostPage)
+async def get_user_posts(
+    user_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get one user's posts, newest first; the first page also carries their post count"""
+    author = await UserService(db).get_principal(user_id)
+    if author is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    try:
+        post_service = PostService(db)
+        return await post_service.get_author_posts_page(author, limit, cursor)
+    
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        print(f"Error fetching posts of user {user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            detail="Failed to fetch posts"
+        )
@@ -0,0 +1,89 @@
+"""
+Group commit for concurrent writes.
+
+Callers submit one item each and await their own result; items arriving
+within a short window (or until the batch is full) are handed to a single
+flush call, so a burst of writes costs one transaction and one commit
+instead of one per request.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, List, Optional, Sequence, Set, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class WriteCoalescer(Generic[T, R]):
+    """Coalesces concurrent submissions into batches written by one flush call
+
+    `flush` receives the items of a batch and must return one result per item,
+    in the same order. If it raises, or returns a different number of results,
+    every caller in the batch gets the error.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[Sequence[R]]],
+        max_size: int,
+        max_wait: float,
+    ):
+        self.flush = flush
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[T, "asyncio.Future[R]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: Set["asyncio.Task[None]"] = set()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[R]" = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush_pending)
+
+        # Shielded so a disconnecting caller can't cancel a write shared with others
+        return await asyncio.shield(future)
+
+    async def close(self) -> None:
+        """Write anything still pending and wait for in-flight batches"""
+        self._flush_pending()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _flush_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._write(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _write(self, batch: List[Tuple[T, "asyncio.Future[R]"]]) -> None:
+        try:
+            results = await self.flush([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"flush returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.error(f"Batched write of {len(batch)} items failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            # Never leave a caller waiting, e.g. when the write was cancelled
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Batched write did not complete"))
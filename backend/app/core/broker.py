@@ -0,0 +1,185 @@
+"""
+In-process pub/sub for Server-Sent Events.
+
+Events are serialized to an SSE frame once and the same bytes are queued for
+every subscriber, so fan-out costs one deque append per subscriber. An idle
+subscriber is a deque and, while it waits, one future; the broker wakes
+them all for heartbeats from a single task instead of a timer per
+connection. Like the caches, the broker lives in one worker and is only
+touched from the event loop thread.
+
+Subscribers whose queue fills up (slow or stalled clients) either lose
+their backlog and get a `resync` event, or are disconnected, per
+`slow_consumer`. Recent frames are kept so a reconnecting EventSource can
+resume from its Last-Event-ID; when that is not possible it gets `resync`.
+"""
+import asyncio
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, List, Optional, Set, Tuple
+
+SLOW_CONSUMER_POLICIES = ("drop", "disconnect")
+
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+@dataclass
+class BrokerStats:
+    subscribers: int = 0
+    published: int = 0
+    # Subscribers that overflowed and lost their backlog, or were disconnected for it
+    dropped: int = 0
+    disconnected: int = 0
+
+
+class Subscription:
+    """One subscriber's queue of pending frames"""
+    __slots__ = ("frames", "closed", "_waiter")
+
+    def __init__(self):
+        self.frames: Deque[bytes] = deque()
+        self.closed = False
+        self._waiter: Optional[asyncio.Future] = None
+
+    def wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def next(self) -> Optional[List[bytes]]:
+        """Wait for pending frames; an empty list means a heartbeat, None that the subscription closed"""
+        if not self.frames and not self.closed:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        if self.closed:
+            return None
+        frames = list(self.frames)
+        self.frames.clear()
+        return frames
+
+
+class Broker:
+    """Fans events out to the subscribers of this worker"""
+
+    def __init__(
+        self,
+        queue_size: int,
+        slow_consumer: str,
+        heartbeat_interval: float,
+        max_subscribers: int,
+        replay_size: int,
+    ):
+        if slow_consumer not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer}")
+        self.queue_size = queue_size
+        self.slow_consumer = slow_consumer
+        self.heartbeat_interval = heartbeat_interval
+        self.max_subscribers = max_subscribers
+        # Event ids are "<epoch>-<seq>"; another epoch (a different worker or
+        # a restart) means the client's position is unknown here
+        self.epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._recent: Deque[Tuple[int, bytes]] = deque(maxlen=replay_size)
+        self._subscribers: Set[Subscription] = set()
+        self._stats = BrokerStats()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: str) -> None:
+        """Queue an event for every current subscriber"""
+        self._seq += 1
+        frame = f"id: {self.epoch}-{self._seq}\nevent: {event}\ndata: {data}\n\n".encode()
+        self._recent.append((self._seq, frame))
+        self._stats.published += 1
+
+        for subscription in list(self._subscribers):
+            if len(subscription.frames) < self.queue_size:
+                subscription.frames.append(frame)
+            elif self.slow_consumer == "drop":
+                # Older events are useless once one is lost; the client refetches instead
+                subscription.frames.clear()
+                subscription.frames.append(self._resync_frame())
+                self._stats.dropped += 1
+            else:
+                self._close(subscription)
+                self._stats.disconnected += 1
+                continue
+            subscription.wake()
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Subscribe and yield SSE frames until the client goes away or the broker closes
+
+        Check `full` before starting a response with this stream.
+        """
+        subscription = Subscription()
+        subscription.frames.extend(self._replay(last_event_id))
+        self._subscribers.add(subscription)
+        try:
+            # Clients reconnect after this many milliseconds if the stream drops
+            yield f"retry: {int(self.heartbeat_interval * 1000)}\n\n".encode()
+            while True:
+                frames = await subscription.next()
+                if frames is None:
+                    return
+                yield b"".join(frames) if frames else HEARTBEAT_FRAME
+        finally:
+            self._subscribers.discard(subscription)
+
+    def stats(self) -> BrokerStats:
+        self._stats.subscribers = len(self._subscribers)
+        return BrokerStats(**vars(self._stats))
+
+    async def start(self) -> None:
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def close(self) -> None:
+        """End every stream still open
+
+        uvicorn only runs lifespan shutdown once connections have closed, so
+        streams are ended before this by its graceful shutdown timeout
+        (SERVER_SHUTDOWN_TIMEOUT); this covers servers that shut down first.
+        """
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        for subscription in list(self._subscribers):
+            self._close(subscription)
+
+    def _replay(self, last_event_id: Optional[str]) -> List[bytes]:
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return [self._resync_frame()]
+        seq = int(seq)
+        if seq >= self._seq:
+            return []
+        if not self._recent or self._recent[0][0] > seq + 1:
+            # Events after the client's position were already evicted
+            return [self._resync_frame()]
+        return [frame for frame_seq, frame in self._recent if frame_seq > seq]
+
+    def _resync_frame(self) -> bytes:
+        # Carries the current id so a reconnect after it does not ask to resync again
+        return f"id: {self.epoch}-{self._seq}\nevent: resync\ndata: {{}}\n\n".encode()
+
+    def _close(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        subscription.closed = True
+        subscription.wake()
+
+    async def _heartbeat(self) -> None:
+        # Keeps proxies from closing idle streams and surfaces dead connections
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            for subscription in self._subscribers:
+                subscription.wake()
@@ -0,0 +1,126 @@
+"""
+In-process LRU cache with per-entry TTL and tag based invalidation.
+
+Caches live inside a single worker process and are only touched from the
+event loop thread, so no locking is needed.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Generic, Hashable, Iterable, Optional, Set, TypeVar
+
+V = TypeVar("V")
+
+# Every named cache, so metrics can be reported without wiring each one up
+_registry: Dict[str, "TTLCache[Any]"] = {}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "tags")
+
+    def __init__(self, value: Any, expires_at: float, tags: Iterable[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.tags = tuple(tags)
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, name: str, max_entries: int, ttl: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._stats = CacheStats()
+        _registry[name] = self
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: V,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """Store a value; `ttl` overrides the cache default for this entry"""
+        if self.max_entries <= 0:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        entry = _Entry(value, expires_at, tags)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        if key in self._entries:
+            self._remove(key)
+            self._stats.invalidations += 1
+
+    def invalidate_tag(self, tag: str) -> None:
+        """Drop every entry stored with the given tag"""
+        for key in list(self._tags.get(tag, ())):
+            self.invalidate(key)
+
+    def clear(self) -> None:
+        self._stats.invalidations += len(self._entries)
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(**{**asdict(self._stats), "size": len(self._entries)})
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_caches() -> Dict[str, "TTLCache[Any]"]:
+    """Get every named cache in this process"""
+    return dict(_registry)
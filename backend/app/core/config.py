@@ -29,7 +29,15 @@ class ServerConfig(BaseSettings):
     write_timeout: int = Field(default=30)
     idle_timeout: int = Field(default=120)
     workers: int = Field(default=4)
+    # Seconds shutdown waits for open requests before cancelling them; long-lived
+    # streams such as /posts/events never finish on their own
+    shutdown_timeout: int = Field(default=10)
     trusted_proxies: List[str] = Field(default_factory=list)
+    # Origins allowed to make credentialed (cookie-carrying) requests; "*"
+    # cannot be used with credentials
+    cors_origins: List[str] = Field(default_factory=lambda: ["http://localhost:5173"])
+    # Serialize responses of @fast_json routes straight to bytes (see app/api/responses.py)
+    fast_serialization: bool = Field(default=True)
 
 
 class DatabaseConfig(BaseSettings):
@@ -48,7 +56,25 @@ class DatabaseConfig(BaseSettings):
     max_open_conns: int = Field(default=25)
     max_idle_conns: int = Field(default=5)
     conn_max_lifetime: int = Field(default=300)
+    # Idle connections beyond max_idle_conns are closed after this many seconds (0 keeps them)
+    conn_max_idle_time: int = Field(default=60)
+    # Seconds a request waits for a free connection before failing
+    pool_timeout: int = Field(default=30)
     migration_path: str = Field(default="./alembic")
+    # Read replicas (SQLAlchemy URLs, e.g. postgresql+asyncpg://user:pw@replica:5432/letsshare_db)
+    replica_urls: List[str] = Field(default_factory=list)
+    # Replicas further behind the primary than this (seconds) stop receiving reads
+    replica_max_lag: float = Field(default=10.0)
+    replica_check_interval: float = Field(default=5.0)
+    # Clients read from the primary for this long (seconds) after a write
+    read_your_writes_window: int = Field(default=5)
+    # SQL strings compiled per engine, keyed by statement structure
+    query_cache_size: int = Field(default=500)
+    # Statements asyncpg keeps prepared per connection
+    prepared_statement_cache_size: int = Field(default=100)
+    # Behind PgBouncer in transaction mode: nothing is kept prepared across
+    # statements and prepared statement names are unique per connection
+    pgbouncer: bool = Field(default=False)
 
     @property
     def database_url(self) -> str:
@@ -72,6 +98,120 @@ class JWTConfig(BaseSettings):
     access_token_duration: int = Field(default=900)
     refresh_token_duration: int = Field(default=604800)
 
+class AuthConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="AUTH_",
+        env_file=".env",
+        case_sensitive=False
+    )
+    
+    principal_cache_size: int = Field(default=10000)
+    principal_cache_ttl: int = Field(default=300)
+    token_cache_size: int = Field(default=10000)
+    login_window: int = Field(default=300)
+    login_email_limit: int = Field(default=10)
+    login_ip_limit: int = Field(default=100)
+    login_limiter_max_keys: int = Field(default=100000)
+    admin_emails: List[str] = Field(default_factory=list)
+
+class PasswordConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="PASSWORD_",
+        env_file=".env",
+        case_sensitive=False
+    )
+    
+    hash_workers: int = Field(default=4)
+    hash_max_pending: int = Field(default=64)
+    bcrypt_rounds: Optional[int] = Field(default=None)
+    target_ms: int = Field(default=250)
+
+class CacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="CACHE_",
+        env_file=".env",
+        case_sensitive=False
+    )
+    
+    enabled: bool = Field(default=True)
+    feed_max_entries: int = Field(default=1024)
+    feed_ttl: int = Field(default=30)
+    invalidation_enabled: bool = Field(default=True)
+    invalidation_channel: str = Field(default="cache_invalidation")
+
+class PostsConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="POSTS_",
+        env_file=".env",
+        case_sensitive=False
+    )
+    
+    batch_enabled: bool = Field(default=False)
+    batch_max_size: int = Field(default=64)
+    batch_max_wait_ms: int = Field(default=5)
+
+class EventsConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="EVENTS_",
+        env_file=".env",
+        case_sensitive=False
+    )
+    
+    enabled: bool = Field(default=True)
+    # Events queued per subscriber before the slow consumer policy applies
+    queue_size: int = Field(default=32)
+    # "drop": discard the backlog and send a resync event; "disconnect": end the stream
+    slow_consumer: str = Field(default="drop")
+    heartbeat_interval: float = Field(default=15.0)
+    # Open event streams per worker
+    max_subscribers: int = Field(default=50000)
+    # Recent events kept for clients resuming with Last-Event-ID
+    replay_size: int = Field(default=256)
+
+class ImportConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="IMPORT_",
+        env_file=".env",
+        case_sensitive=False
+    )
+    
+    chunk_size: int = Field(default=5000)
+    max_reported_rejections: int = Field(default=100)
+
+class MetricsConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="METRICS_",
+        env_file=".env",
+        case_sensitive=False
+    )
+    
+    # Off by default: GET /metrics is unauthenticated, so only enable it where
+    # the scraper can reach it and the public cannot
+    enabled: bool = Field(default=False)
+    # Shared directory for merging metrics across uvicorn workers; unset for a single worker
+    multiprocess_dir: Optional[str] = Field(default=None)
+    # Seconds between each worker's snapshot writes in multiprocess mode
+    flush_interval: float = Field(default=5.0)
+
+
+class ProfilerConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="PROFILER_",
+        env_file=".env",
+        case_sensitive=False
+    )
+    
+    enabled: bool = Field(default=True)
+    # Share of requests whose queries are counted per request (0.0 - 1.0)
+    sample_rate: float = Field(default=1.0)
+    # Statements slower than this are logged, sampled or not
+    slow_query_ms: float = Field(default=200.0)
+    # Statement shapes repeated this often in one request are logged as likely N+1
+    n_plus_one_threshold: int = Field(default=10)
+    # Add a Server-Timing header with the DB time of profiled requests
+    server_timing: bool = Field(default=False)
+
+
 class Config(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env", 
@@ -84,6 +224,14 @@ class Config(BaseSettings):
     server: ServerConfig = Field(default_factory=ServerConfig)
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     jwt: JWTConfig = Field(default_factory=JWTConfig)
+    auth: AuthConfig = Field(default_factory=AuthConfig)
+    password: PasswordConfig = Field(default_factory=PasswordConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    posts: PostsConfig = Field(default_factory=PostsConfig)
+    events: EventsConfig = Field(default_factory=EventsConfig)
+    bulk_import: ImportConfig = Field(default_factory=ImportConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    profiler: ProfilerConfig = Field(default_factory=ProfilerConfig)
 
     def is_development(self) -> bool:
         return self.app.environment == "development"
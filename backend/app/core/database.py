@@ -1,13 +1,21 @@
 """
 Database configuration and connection management.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from fastapi import Request
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base
 from sqlalchemy import MetaData, text
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable, Dict, List, Optional
+import asyncio
+import asyncpg
+import itertools
 import logging
 
 from app.core.config import get_config
+from app.core.pool import InstrumentedPool, instrument_engine
+from app.core.profiling import profile_engine
+from app.core.statement_cache import connect_args, track_statement_cache
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +33,65 @@ convention = {
 
 Base.metadata = MetaData(naming_convention=convention)
 
+# Seconds a replica is behind the primary; 0 when it has replayed all it received
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# Set on responses to requests that wrote; while present, reads go to the primary
+READ_YOUR_WRITES_COOKIE = "db_primary"
+
+
+class Replica:
+    """A read replica engine and the result of its last health check"""
+
+    def __init__(self, url: str, engine: AsyncEngine):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = engine
+        self.session_factory = async_sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False
+        )
+        # None until the first health check
+        self.healthy: Optional[bool] = None
+        self.lag: Optional[float] = None
+        self.error: Optional[str] = None
+
+
+class LazySession:
+    """Stands in for an AsyncSession that is only created on first use
+
+    Requests that never query (token refresh, auth failures, cache hits) then
+    build no session and pick no replica. close() ends the unit of work and
+    returns the connection right away; the next use starts a new session.
+    """
+
+    def __init__(self, session_factory: Callable[[], async_sessionmaker]):
+        self._session_factory = session_factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            session_factory = self._session_factory()
+            if session_factory is None:
+                raise RuntimeError("Session factory is not initialized.")
+            self._session = session_factory()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+
 class DatabaseManager:
     """Database connection manager"""
     
@@ -32,48 +99,152 @@ class DatabaseManager:
         self.config = get_config()
         self.engine = None
         self.session_factory = None
+        self.replicas: List[Replica] = []
+        self._next_replica = itertools.count()
+        self._health_task: Optional[asyncio.Task] = None
+        self._trim_task: Optional[asyncio.Task] = None
     
     async def initialize(self):
-        self.engine = create_async_engine(
-            self.config.database.database_url,
-            echo=self.config.is_development(),
-            pool_size=self.config.database.max_open_conns,
-            max_overflow=10,
-            pool_timeout=30,
-            pool_recycle=self.config.database.conn_max_lifetime,
-            pool_pre_ping=True,
-        )
+        self.engine = self._create_engine(self.config.database.database_url)
         
         self.session_factory = async_sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
             expire_on_commit=False
         )
+
+        self.replicas = [
+            Replica(url, self._create_engine(url)) for url in self.config.database.replica_urls
+        ]
+        if self.replicas:
+            await self.check_replicas()
+            self._health_task = asyncio.create_task(self._monitor_replicas())
+        if self.config.database.conn_max_idle_time > 0:
+            self._trim_task = asyncio.create_task(self._trim_idle_periodically())
         
         logger.info("Database connection established")
     
     async def close(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        if self._trim_task is not None:
+            self._trim_task.cancel()
+            self._trim_task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
         if self.engine:
             await self.engine.dispose()
             logger.info("Database connection closed")
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        database = self.config.database
+        # Up to max_open_conns connections; most recently used first, so the
+        # ones a quiet period does not need go idle and are trimmed (see
+        # trim_idle_connections)
+        engine = create_async_engine(
+            url,
+            echo=self.config.is_development(),
+            poolclass=InstrumentedPool,
+            pool_size=database.max_open_conns,
+            max_overflow=0,
+            pool_use_lifo=True,
+            pool_timeout=database.pool_timeout,
+            pool_recycle=database.conn_max_lifetime,
+            pool_pre_ping=True,
+            query_cache_size=database.query_cache_size,
+            connect_args=connect_args(url),
+        )
+        instrument_engine(engine)
+        track_statement_cache(engine)
+        if self.config.profiler.enabled:
+            profile_engine(engine)
+        return engine
+
+    def engines(self) -> Dict[str, AsyncEngine]:
+        """Every engine by name: the primary and each replica"""
+        engines = {"primary": self.engine} if self.engine is not None else {}
+        engines.update((replica.name, replica.engine) for replica in self.replicas)
+        return engines
+
+    def read_session_factory(self) -> async_sessionmaker:
+        """Session factory of the next healthy replica, or the primary's if none is healthy"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return self.session_factory
+        return healthy[next(self._next_replica) % len(healthy)].session_factory
+
+    async def check_replicas(self) -> None:
+        """Measure each replica's lag; unreachable or lagging replicas stop receiving reads"""
+        await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+
+    async def _check_replica(self, replica: Replica) -> None:
+        max_lag = self.config.database.replica_max_lag
+        try:
+            lag = await asyncio.wait_for(
+                self._replica_lag(replica), self.config.database.replica_check_interval
+            )
+            replica.lag = float(lag) if lag is not None else 0.0
+            replica.error = None if replica.lag <= max_lag else f"lag {replica.lag:.1f}s > {max_lag}s"
+        except Exception as e:
+            replica.lag = None
+            replica.error = str(e) or type(e).__name__
+
+        healthy = replica.error is None
+        if healthy != replica.healthy:
+            if healthy:
+                logger.info(f"Replica {replica.name} is healthy")
+            else:
+                logger.warning(f"Replica {replica.name} removed from reads: {replica.error}")
+        replica.healthy = healthy
+
+    async def _replica_lag(self, replica: Replica) -> Optional[float]:
+        async with replica.engine.connect() as conn:
+            return await conn.scalar(REPLICA_LAG_SQL)
+
+    async def _monitor_replicas(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.database.replica_check_interval)
+            await self.check_replicas()
+    
+    def trim_idle_connections(self) -> None:
+        """Close connections idle longer than DB_CONN_MAX_IDLE_TIME, beyond DB_MAX_IDLE_CONNS per engine"""
+        database = self.config.database
+        keep = min(database.max_idle_conns, database.max_open_conns)
+        for name, engine in self.engines().items():
+            pool = engine.pool
+            if isinstance(pool, InstrumentedPool):
+                trimmed = pool.trim_idle(keep, database.conn_max_idle_time)
+                if trimmed:
+                    logger.debug(f"Closed {trimmed} idle connections of {name}")
+
+    async def _trim_idle_periodically(self) -> None:
+        # Idle connections are closed between 1x and 1.5x the idle time
+        while True:
+            await asyncio.sleep(self.config.database.conn_max_idle_time / 2)
+            self.trim_idle_connections()
+
+    async def create_listener_connection(self) -> asyncpg.Connection:
+        """Open a dedicated asyncpg connection outside the pool, e.g. for LISTEN"""
+        return await asyncpg.connect(self.config.database.sync_database_url)
     
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get database session with transaction management"""
+    async def get_session(self, readonly: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        """Get a lazily created database session with transaction management
+
+        Read-only sessions are served by a healthy replica when there is one,
+        picked when the session is first used.
+        """
         if self.session_factory is None:
             await self.initialize()
         
-        session_factory = self.session_factory
-        if session_factory is None:
-            raise RuntimeError("Session factory is not initialized.")
-        
-        async with session_factory() as session:
-            try:
-                yield session
-            except Exception:
-                await session.rollback()
-                raise
-            finally:
-                await session.close()
+        session = LazySession(self.read_session_factory if readonly else lambda: self.session_factory)
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
 
 
 # Global database manager instance
@@ -82,11 +253,29 @@ db_manager = DatabaseManager()
 
 # Dependency for FastAPI
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Database dependency for FastAPI"""
+    """Database dependency for FastAPI (primary)"""
     async for session in db_manager.get_session():
         yield session
 
 
+async def get_write_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Primary database session for requests that write
+
+    Flags the request so the client reads from the primary for a short while
+    afterwards (see ReadYourWritesMiddleware).
+    """
+    request.state.db_wrote = True
+    async for session in db_manager.get_session():
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only database session, from a replica unless the client wrote recently"""
+    readonly = READ_YOUR_WRITES_COOKIE not in request.cookies
+    async for session in db_manager.get_session(readonly=readonly):
+        yield session
+
+
 async def init_database():
     await db_manager.initialize()
 
@@ -0,0 +1,141 @@
+"""
+Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+Writers queue an event on their own transaction with pg_notify, so it is
+delivered to the other workers only if the write commits. Every worker
+holds one dedicated listener connection (outside the pool) and dispatches
+incoming events to the handlers subscribed to their topic.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_caches
+from app.core.config import get_config
+from app.core.database import DatabaseManager, db_manager
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[Dict[str, Any]], None]
+
+
+class InvalidationBus:
+    """Publishes and receives cache invalidation events between workers"""
+
+    def __init__(self, manager: DatabaseManager):
+        self.manager = manager
+        self.config = get_config()
+        self.channel = self.config.cache.invalidation_channel
+        self.enabled = self.config.cache.invalidation_enabled
+        # Lets a worker ignore the echo of its own events
+        self.origin = uuid.uuid4().hex
+        # (handler, whether it also receives this worker's own events) per topic
+        self._handlers: Dict[str, List[Tuple[EventHandler, bool]]] = defaultdict(list)
+        self._conn = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def subscribe(self, topic: str, handler: EventHandler, own_events: bool = False) -> None:
+        """Handle events of a topic published by other workers
+
+        With own_events, the handler also receives this worker's events as
+        they come back from Postgres, so it sees every worker's events in the
+        same (commit) order. Handlers run in subscription order.
+        """
+        self._handlers[topic].append((handler, own_events))
+
+    async def publish(self, session: AsyncSession, topic: str, **payload: Any) -> None:
+        """Queue an event on the session's transaction; other workers receive it on commit"""
+        if not self.enabled or session.get_bind().dialect.name != "postgresql":
+            return
+
+        message = json.dumps({"topic": topic, "origin": self.origin, **payload})
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self.channel, "payload": message}
+        )
+
+    def dispatch(self, event: Dict[str, Any], own: bool = False) -> None:
+        for handler, own_events in self._handlers.get(event.get("topic", ""), ()):
+            if own and not own_events:
+                continue
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Invalidation handler failed for {event}: {e}")
+
+    async def start(self) -> None:
+        # Only Postgres has LISTEN/NOTIFY; publish() is a no-op elsewhere too
+        if not self.enabled or self.manager.engine.dialect.name != "postgresql":
+            return
+        self._stopping = False
+        await self._listen()
+        logger.info(f"Listening for cache invalidations on '{self.channel}'")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+    async def _listen(self) -> None:
+        conn = await self.manager.create_listener_connection()
+        await conn.add_listener(self.channel, self._on_notify)
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation event: {payload!r}")
+            return
+        self.dispatch(event, own=event.get("origin") == self.origin)
+
+    def _on_terminated(self, conn) -> None:
+        if self._stopping:
+            return
+        logger.warning("Invalidation listener connection lost, reconnecting")
+        self._conn = None
+        self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 0.5
+        while not self._stopping:
+            try:
+                await self._listen()
+            except Exception as e:
+                logger.error(f"Invalidation listener reconnect failed: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+                continue
+
+            # Events sent while disconnected are lost, so nothing cached can be trusted
+            for cache in get_caches().values():
+                cache.clear()
+            # and subscribers must resynchronize whatever they derive from
+            # events; every handler accepts {"action": "resync"}
+            for topic in list(self._handlers):
+                self.dispatch({"topic": topic, "action": "resync"})
+            logger.info("Invalidation listener reconnected, caches cleared")
+            return
+
+
+# Global invalidation bus instance
+invalidation_bus = InvalidationBus(db_manager)
+
+
+async def start_invalidation_bus():
+    await invalidation_bus.start()
+
+async def stop_invalidation_bus():
+    await invalidation_bus.stop()
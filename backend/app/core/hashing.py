@@ -0,0 +1,175 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow and CPU bound; running it inline in an async
+handler stalls every other request on the worker. All hashing goes through
+one shared CryptContext and a bounded thread pool instead (bcrypt releases
+the GIL while it works). When more work is pending than the pool is allowed
+to queue, new requests are rejected rather than piling up.
+
+The bcrypt cost can be pinned with PASSWORD_BCRYPT_ROUNDS; stored hashes
+using any other cost are then flagged for rehashing on the next login. To
+pick a cost that fits the host's latency budget run:
+
+    python -m app.core.hashing calibrate --target-ms 250
+"""
+import argparse
+import asyncio
+import bisect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from app.core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# bcrypt costs considered by calibration
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 16
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing pool is saturated"""
+
+
+@dataclass
+class HashingStats:
+    completed: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    queue_depth: int = 0
+    latency_sum: float = 0.0
+    latency_max: float = 0.0
+    # Cumulative counts per LATENCY_BUCKETS bound, plus +Inf
+    latency_buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+
+class PasswordHasher:
+    """Shared CryptContext backed by a bounded thread pool"""
+
+    def __init__(self, max_workers: int, max_pending: int, rounds: Optional[int] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.context = build_context(rounds)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._stats = HashingStats()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self.context.verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; on success also return a new hash if the stored one is outdated"""
+        return await self._run(self.context.verify_and_update, password, hashed)
+
+    def stats(self) -> HashingStats:
+        stats = HashingStats(**vars(self._stats))
+        stats.latency_buckets = list(self._stats.latency_buckets)
+        stats.in_flight = self._pending
+        stats.queue_depth = max(0, self._pending - self.max_workers)
+        return stats
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_pending:
+            self._stats.rejected += 1
+            raise HashingBusyError("Password hashing capacity exhausted")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+            self._observe(time.perf_counter() - start)
+
+    def _observe(self, elapsed: float) -> None:
+        stats = self._stats
+        stats.completed += 1
+        stats.latency_sum += elapsed
+        stats.latency_max = max(stats.latency_max, elapsed)
+        for i in range(bisect.bisect_left(LATENCY_BUCKETS, elapsed), len(stats.latency_buckets)):
+            stats.latency_buckets[i] += 1
+
+
+def build_context(rounds: Optional[int] = None) -> CryptContext:
+    """Build the bcrypt context; a pinned cost also marks other costs as needing an update"""
+    if rounds is None:
+        return CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def calibrate(target_seconds: float, samples: int = 3) -> int:
+    """Benchmark bcrypt on this host and return the highest cost within the target time"""
+    chosen = MIN_BCRYPT_ROUNDS
+    for rounds in range(MIN_BCRYPT_ROUNDS, MAX_BCRYPT_ROUNDS + 1):
+        context = build_context(rounds)
+        start = time.perf_counter()
+        for _ in range(samples):
+            context.hash("calibration-password")
+        elapsed = (time.perf_counter() - start) / samples
+        logger.info(f"bcrypt rounds={rounds}: {elapsed * 1000:.1f} ms")
+
+        if elapsed > target_seconds:
+            break
+        chosen = rounds
+    return chosen
+
+
+config = get_config()
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    max_workers=config.password.hash_workers,
+    max_pending=config.password.hash_max_pending,
+    rounds=config.password.bcrypt_rounds,
+)
+
+
+def close_password_hasher():
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Password hashing tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    calibrate_parser = commands.add_parser(
+        "calibrate", help="Pick the bcrypt cost that fits a target hashing time"
+    )
+    calibrate_parser.add_argument(
+        "--target-ms", type=int, default=config.password.target_ms,
+        help="Target time for a single hash in milliseconds"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    rounds = calibrate(args.target_ms / 1000)
+    print(f"PASSWORD_BCRYPT_ROUNDS={rounds}")
@@ -0,0 +1,225 @@
+"""
+Per-route HTTP request metrics in Prometheus text format.
+
+Each worker keeps plain counters per (method, route template), touched only
+from its event loop thread, so recording a request takes no locks. The route
+is only known once the router has matched, so the in-flight gauge is one per
+worker rather than per route. With a
+single worker /metrics renders them directly. With several uvicorn workers
+set METRICS_MULTIPROCESS_DIR: every worker periodically writes a snapshot
+of its counters to <dir>/<pid>.json, and the worker serving /metrics merges
+all snapshots. Counters and histograms of exited workers are kept so totals
+never go backwards; in-flight gauges only count live workers. Snapshots of
+other workers can be up to METRICS_FLUSH_INTERVAL seconds old.
+"""
+import asyncio
+import bisect
+import json
+import logging
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for requests that matched no route, so scans of random paths
+# cannot create unbounded label sets
+UNMATCHED_ROUTE = "<unmatched>"
+
+RouteKey = Tuple[str, str]
+
+
+class RouteStats:
+    """Counters of one (method, route); latency buckets are not cumulative here"""
+    __slots__ = ("buckets", "latency_sum", "count", "request_bytes", "response_bytes", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.count = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses: Dict[str, int] = {}
+
+    def observe(self, status: int, elapsed: float, request_bytes: int, response_bytes: int) -> None:
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        self.latency_sum += elapsed
+        self.count += 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        status_key = str(status)
+        self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def merge(self, data: dict) -> None:
+        self.buckets = [a + b for a, b in zip(self.buckets, data["buckets"])]
+        self.latency_sum += data["latency_sum"]
+        self.count += data["count"]
+        self.request_bytes += data["request_bytes"]
+        self.response_bytes += data["response_bytes"]
+        for status, count in data["statuses"].items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+
+class RequestMetrics:
+    """Request metrics of this worker"""
+
+    def __init__(self, multiprocess_dir: Optional[str] = None, flush_interval: float = 5.0):
+        self.routes: Dict[RouteKey, RouteStats] = {}
+        self.in_flight = 0
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def route(self, method: str, route: str) -> RouteStats:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        return stats
+
+    def collect(self) -> Tuple[Dict[RouteKey, RouteStats], int]:
+        """Route counters and in-flight requests, merged across workers in multiprocess mode"""
+        if not self.multiprocess_dir:
+            return self.routes, self.in_flight
+
+        self.flush()
+        merged: Dict[RouteKey, RouteStats] = {}
+        in_flight = 0
+        for pid, snapshot in self._read_snapshots():
+            if _is_alive(pid):
+                in_flight += snapshot["in_flight"]
+            for entry in snapshot["routes"]:
+                key = (entry["method"], entry["route"])
+                merged.setdefault(key, RouteStats()).merge(entry["stats"])
+        return merged, in_flight
+
+    def flush(self) -> None:
+        """Write this worker's snapshot for the others to merge"""
+        if not self.multiprocess_dir:
+            return
+        snapshot = {
+            "in_flight": self.in_flight,
+            "routes": [
+                {"method": method, "route": route, "stats": stats.to_dict()}
+                for (method, route), stats in self.routes.items()
+            ],
+        }
+        path = os.path.join(self.multiprocess_dir, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        # Atomic, so readers never see a partly written snapshot
+        os.replace(tmp_path, path)
+
+    def _read_snapshots(self) -> Iterable[Tuple[int, dict]]:
+        for name in os.listdir(self.multiprocess_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, name)) as f:
+                    yield int(name[:-len(".json")]), json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping metrics snapshot {name}: {e}")
+
+    async def start(self) -> None:
+        if self.multiprocess_dir:
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"Failed to write metrics snapshot: {e}")
+
+
+def render_prometheus(routes: Dict[RouteKey, RouteStats], in_flight: int) -> str:
+    """Render request metrics in the Prometheus text exposition format"""
+    lines = [
+        "# HELP http_requests_total Requests handled, by route and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route), stats in sorted(routes.items()):
+        for status, count in sorted(stats.statuses.items()):
+            lines.append(f"http_requests_total{_labels(method, route, status=status)} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency, by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), stats in sorted(routes.items()):
+        cumulative = 0
+        for bound, count in zip([*map(str, LATENCY_BUCKETS), "+Inf"], stats.buckets):
+            cumulative += count
+            lines.append(f"http_request_duration_seconds_bucket{_labels(method, route, le=bound)} {cumulative}")
+        lines.append(f"http_request_duration_seconds_sum{_labels(method, route)} {stats.latency_sum}")
+        lines.append(f"http_request_duration_seconds_count{_labels(method, route)} {stats.count}")
+
+    lines += [
+        "# HELP http_requests_in_flight Requests currently being handled.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {in_flight}",
+    ]
+
+    for name, kind, help_text, attribute in (
+        ("http_request_size_bytes_total", "counter", "Request body bytes received.", "request_bytes"),
+        ("http_response_size_bytes_total", "counter", "Response body bytes sent.", "response_bytes"),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for (method, route), stats in sorted(routes.items()):
+            lines.append(f"{name}{_labels(method, route)} {getattr(stats, attribute)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, route: str, **extra: str) -> str:
+    labels = {"method": method, "route": route, **extra}
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Global request metrics of this worker
+request_metrics = RequestMetrics(
+    multiprocess_dir=config.metrics.multiprocess_dir,
+    flush_interval=config.metrics.flush_interval,
+)
+
+
+async def start_request_metrics():
+    await request_metrics.start()
+
+
+async def stop_request_metrics():
+    await request_metrics.stop()
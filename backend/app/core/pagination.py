@@ -0,0 +1,67 @@
+"""
+Keyset pagination helpers.
+
+Cursors are opaque to clients: a urlsafe base64 encoded JSON array holding
+the sort key of the last row of the previous page.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Largest value of an INTEGER primary key
+MAX_ROW_ID = 2 ** 31 - 1
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client supplied cursor cannot be decoded"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) sort key into an opaque cursor"""
+    return _encode([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode an opaque cursor back into a (created_at, id) sort key"""
+    try:
+        created_at, row_id = _decode(cursor)
+        created_at, row_id = datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+    # created_at is stored naive (UTC) and ids are 32-bit; anything else is
+    # crafted and would only fail in the database
+    if created_at.tzinfo is not None or not 0 <= row_id <= MAX_ROW_ID:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return created_at, row_id
+
+
+def encode_rank_cursor(rank: float, row_id: int) -> str:
+    """Encode a (rank, id) sort key of ranked search results into an opaque cursor"""
+    return _encode([rank, row_id])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode an opaque cursor back into a (rank, id) sort key"""
+    try:
+        rank, row_id = _decode(cursor)
+        return float(rank), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def _encode(key: List[Any]) -> str:
+    raw = json.dumps(key, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
@@ -0,0 +1,150 @@
+"""
+Connection pool instrumentation and idle trimming.
+
+InstrumentedPool is SQLAlchemy's async queue pool with timing around
+connect(), so the wait for a free connection (or for a new one to open) and
+checkout timeouts are recorded per engine. Everything else comes from pool
+events: connect/close keep the count of open connections, checkout/checkin
+keep the set of idle ones with the time each was returned, and pre-ping
+failures are counted from the engine's handle_error event.
+
+The pool hands out the most recently returned connection first (LIFO), so
+connections a quiet period does not need stay unused at the bottom of the
+queue. trim_idle() closes those idle longer than DB_CONN_MAX_IDLE_TIME,
+keeping at least DB_MAX_IDLE_CONNS open; their pool slots reconnect when
+load needs them again.
+"""
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    pre_ping_failures: int = 0
+    opened: int = 0
+    closed: int = 0
+    # Idle connections closed by trim_idle
+    trimmed: int = 0
+    wait_sum: float = 0.0
+    wait_max: float = 0.0
+    # Cumulative counts per WAIT_BUCKETS bound, plus +Inf
+    wait_buckets: List[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS) + 1))
+    # Open connections waiting in the pool, with the time each was returned
+    idle: Dict[ConnectionPoolEntry, float] = field(default_factory=dict)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout waits and timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> "InstrumentedPool":
+        # Engine.dispose() and pre-ping invalidation swap in a new pool; keep counting
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self._observe(time.perf_counter() - start)
+
+    def _observe(self, waited: float) -> None:
+        stats = self.stats
+        stats.checkouts += 1
+        stats.wait_sum += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        for i in range(bisect.bisect_left(WAIT_BUCKETS, waited), len(stats.wait_buckets)):
+            stats.wait_buckets[i] += 1
+
+    def trim_idle(self, keep: int, max_idle_time: float) -> int:
+        """Close connections idle longer than max_idle_time, keeping `keep` open; returns how many"""
+        idle = self.stats.idle
+        surplus = len(idle) - keep
+        if surplus <= 0:
+            return 0
+        cutoff = time.monotonic() - max_idle_time
+        stale = sorted((since, id(record), record) for record, since in idle.items() if since < cutoff)
+        trimmed = [record for _, _, record in stale[:surplus]]
+        for record in trimmed:
+            # Idle connections are in no transaction; the entry stays in the
+            # pool and reconnects on its next checkout
+            record.invalidate()
+        self.stats.trimmed += len(trimmed)
+        return len(trimmed)
+
+    def snapshot(self) -> dict:
+        """Counters plus the current open / in-use / idle / overflow gauges"""
+        stats = self.stats
+        return {
+            "size": self.size(),
+            "open": stats.opened - stats.closed,
+            "in_use": self.checkedout(),
+            "idle": len(stats.idle),
+            # QueuePool counts overflow from -pool_size up
+            "overflow": max(0, self.overflow()),
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "pre_ping_failures": stats.pre_ping_failures,
+            "trimmed": stats.trimmed,
+            "wait_sum": stats.wait_sum,
+            "wait_max": stats.wait_max,
+            "wait_buckets": dict(zip([*map(str, WAIT_BUCKETS), "+Inf"], stats.wait_buckets)),
+        }
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Track connections and pre-ping failures of an engine built with InstrumentedPool"""
+
+    sync_engine = engine.sync_engine
+
+    def stats() -> PoolStats:
+        return sync_engine.pool.stats
+
+    @event.listens_for(sync_engine, "connect")
+    def opened(dbapi_connection, connection_record) -> None:
+        stats().opened += 1
+
+    @event.listens_for(sync_engine, "close")
+    def closed(dbapi_connection, connection_record) -> None:
+        stats().closed += 1
+        stats().idle.pop(connection_record, None)
+
+    @event.listens_for(sync_engine, "close_detached")
+    def closed_detached(dbapi_connection) -> None:
+        stats().closed += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def checked_out(dbapi_connection, connection_record, connection_proxy) -> None:
+        stats().idle.pop(connection_record, None)
+
+    @event.listens_for(sync_engine, "checkin")
+    def checked_in(dbapi_connection, connection_record) -> None:
+        # None when the connection was invalidated while checked out
+        if dbapi_connection is not None:
+            stats().idle[connection_record] = time.monotonic()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def count_pre_ping_failure(context) -> None:
+        # context.engine is not set for pre-ping errors, which happen before
+        # a Connection exists
+        if context.is_pre_ping and isinstance(sync_engine.pool, InstrumentedPool):
+            stats().pre_ping_failures += 1
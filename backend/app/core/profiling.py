@@ -0,0 +1,139 @@
+"""
+SQL query profiling.
+
+Every statement is timed through cursor execute events, and statements
+slower than PROFILER_SLOW_QUERY_MS are logged with their parameter values
+redacted. A sampled share of requests additionally get a QueryProfile in a
+contextvar, which counts their queries, DB time and repeated statement
+shapes; a shape repeated PROFILER_N_PLUS_ONE_THRESHOLD times or more in one
+request is logged as a likely N+1. Sessions created in background tasks
+inherit the profile of the request that started the task.
+"""
+import contextvars
+import logging
+import random
+import re
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+# Numbered placeholders (asyncpg renders them with a type cast) and expanded
+# IN lists make otherwise identical statements differ
+_PLACEHOLDERS = re.compile(r"\$\d+(?:::\w+)?")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+# Characters of a statement kept in log lines
+LOGGED_STATEMENT_LENGTH = 500
+
+
+class QueryProfile:
+    """Queries run on behalf of one request"""
+    __slots__ = ("query_count", "db_time", "statements")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.query_count += 1
+        self.db_time += elapsed
+        self.statements[statement] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes run at least `threshold` times, most frequent first"""
+        shapes: Counter = Counter()
+        for statement, count in self.statements.items():
+            shapes[statement_shape(statement)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        queries = "query" if self.query_count == 1 else "queries"
+        return f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} {queries}"'
+
+
+_current_profile: contextvars.ContextVar[Optional[QueryProfile]] = contextvars.ContextVar(
+    "query_profile", default=None
+)
+
+
+def start_profile() -> Optional[contextvars.Token]:
+    """Profile the current request if it is sampled; returns the token for finish_profile"""
+    profiler = config.profiler
+    if not profiler.enabled or random.random() >= profiler.sample_rate:
+        return None
+    return _current_profile.set(QueryProfile())
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _current_profile.get()
+
+
+def finish_profile(token: contextvars.Token, label: str) -> None:
+    """Log likely N+1 patterns of the current request and stop profiling it"""
+    profile = _current_profile.get()
+    _current_profile.reset(token)
+    if profile is None or not profile.query_count:
+        return
+
+    for shape, count in profile.repeated_shapes(config.profiler.n_plus_one_threshold):
+        logger.warning(f"Possible N+1 in {label}: {count} queries like {_truncate(shape)}")
+    logger.debug(
+        f"{label}: {profile.query_count} queries in {profile.db_time * 1000:.1f} ms"
+    )
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with placeholders and IN lists collapsed and whitespace normalized"""
+    shape = _PLACEHOLDERS.sub("?", statement)
+    shape = _PLACEHOLDER_LISTS.sub("(?)", shape)
+    return " ".join(shape.split())
+
+
+def redact(parameters, executemany: bool) -> str:
+    """Describe bound parameters without their values"""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters or ()) + ")"
+
+
+def profile_engine(engine: AsyncEngine) -> None:
+    """Time every statement of an engine for the slow-query log and request profiles"""
+
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        context._profile_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - context._profile_start
+
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+
+        if elapsed * 1000 >= config.profiler.slow_query_ms:
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms): {_truncate(statement)} "
+                f"parameters={redact(parameters, executemany)}"
+            )
+
+
+def _truncate(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) <= LOGGED_STATEMENT_LENGTH:
+        return statement
+    return statement[:LOGGED_STATEMENT_LENGTH] + "..."
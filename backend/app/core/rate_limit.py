@@ -0,0 +1,73 @@
+"""
+In-memory sliding window rate limiting.
+
+Each key stores only the counts of the current and previous fixed windows;
+the sliding count is estimated by weighting the previous window by how much
+of it still overlaps the sliding window. Stale keys are swept out once per
+window so memory tracks the set of recently active keys. When `max_keys`
+live keys are tracked, new keys are refused rather than evicting a live
+count, which would let a flood of junk keys reset a key under attack.
+"""
+import time
+from typing import Dict, Optional
+
+
+class _Window:
+    __slots__ = ("index", "current", "previous")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.current = 0
+        self.previous = 0
+
+
+class SlidingWindowLimiter:
+    """Allows at most `limit` hits per key within any `window` seconds"""
+
+    def __init__(self, limit: int, window: float, max_keys: int):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._keys: Dict[str, _Window] = {}
+        # Keys only go stale when a new window starts, so one sweep per window is enough
+        self._swept_index = int(time.monotonic() // window)
+
+    def hit(self, key: str) -> Optional[float]:
+        """Count a hit; return seconds to wait if the key is over its limit (the hit is not counted)
+
+        A new key is also refused while `max_keys` live keys are tracked.
+        """
+        now = time.monotonic()
+        index, offset = divmod(now, self.window)
+        index = int(index)
+        if index != self._swept_index:
+            self._sweep(index)
+
+        state = self._keys.get(key)
+        if state is None:
+            if len(self._keys) >= self.max_keys:
+                # Every tracked key is live; room frees up when the next window starts
+                return self.window - offset
+            state = self._keys[key] = _Window(index)
+        elif state.index != index:
+            state.previous = state.current if state.index == index - 1 else 0
+            state.current = 0
+            state.index = index
+
+        overlap = 1 - offset / self.window
+        if state.previous * overlap + state.current >= self.limit:
+            return self.window - offset
+
+        state.current += 1
+        return None
+
+    def reset(self, key: str) -> None:
+        self._keys.pop(key, None)
+
+    def _sweep(self, index: int) -> None:
+        for key in [key for key, state in self._keys.items() if state.index < index - 1]:
+            del self._keys[key]
+        self._swept_index = index
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,85 @@
+"""
+In-process full-text search.
+
+Postgres serves post search from a tsvector column. Backends without
+full-text search (SQLite in tests and local development) use this inverted
+index instead, kept in memory and updated incrementally as posts are
+written. It matches whole lowercased words, without stemming or stop words;
+every query word must appear in a document.
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+class InvertedIndex:
+    """Word -> {document id: term frequency} postings with TF-IDF ranking"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._documents: Dict[int, Counter] = {}
+
+    def add(self, doc_id: int, text: str) -> None:
+        """Index a document, replacing any previous version of it"""
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self._documents[doc_id] = terms
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+
+    def remove(self, doc_id: int) -> None:
+        terms = self._documents.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def rebuild(self, documents: Iterable[Tuple[int, str]]) -> None:
+        self.clear()
+        for doc_id, text in documents:
+            self.add(doc_id, text)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._documents.clear()
+
+    def search(
+        self, query: str, limit: int, before: Optional[Tuple[float, int]] = None
+    ) -> List[Tuple[float, int]]:
+        """Best matches as (rank, id), highest rank first, strictly after the `before` sort key"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        postings = [self._postings.get(term) for term in terms]
+        if not all(postings):
+            return []
+        # Intersect starting from the rarest word
+        postings.sort(key=len)
+        matches = set(postings[0]).intersection(*postings[1:])
+
+        total = len(self._documents)
+        ranked = []
+        for doc_id in matches:
+            rank = sum(
+                posting[doc_id] * math.log(1 + total / len(posting)) for posting in postings
+            )
+            key = (rank, doc_id)
+            if before is None or key < before:
+                ranked.append(key)
+
+        ranked.sort(reverse=True)
+        return ranked[:limit]
+
+    def __len__(self) -> int:
+        return len(self._documents)
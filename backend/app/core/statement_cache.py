@@ -0,0 +1,87 @@
+"""
+Statement cache settings and hit rates.
+
+SQLAlchemy compiles each statement structure once per engine and reuses the
+SQL string when the same structure runs again; asyncpg then keeps the
+prepared statement per connection. The hot repository queries are built once
+with bound parameters, so a cache hit costs neither building nor re-keying
+the statement.
+"""
+import uuid
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_config
+
+config = get_config()
+
+
+@dataclass
+class StatementCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Statements that cannot be cached, e.g. raw SQL strings
+    uncached: int = 0
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        cached = self.hits + self.misses
+        return self.hits / cached if cached else None
+
+
+_stats: "weakref.WeakKeyDictionary[Engine, StatementCacheStats]" = weakref.WeakKeyDictionary()
+
+
+def connect_args(url: str) -> Dict[str, Any]:
+    """asyncpg connection arguments for the configured prepared statement caching"""
+    if make_url(url).get_driver_name() != "asyncpg":
+        return {}
+    if config.database.pgbouncer:
+        # PgBouncer may hand each transaction a different server connection,
+        # where named statements prepared earlier do not exist (or clash)
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": config.database.prepared_statement_cache_size}
+
+
+def track_statement_cache(engine: AsyncEngine) -> None:
+    """Count compiled cache hits and misses of an engine's statements"""
+
+    stats = _stats[engine.sync_engine] = StatementCacheStats()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def count_cache_hit(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context.cache_hit is CacheStats.CACHE_HIT:
+            stats.hits += 1
+        elif context.cache_hit is CacheStats.CACHE_MISS:
+            stats.misses += 1
+        else:
+            stats.uncached += 1
+
+
+def statement_cache_snapshot(engine: AsyncEngine) -> Optional[dict]:
+    stats = _stats.get(engine.sync_engine)
+    if stats is None:
+        return None
+    compiled_cache = engine.sync_engine._compiled_cache
+    return {
+        "hits": stats.hits,
+        "misses": stats.misses,
+        "uncached": stats.uncached,
+        "hit_ratio": stats.hit_ratio,
+        "compiled_statements": len(compiled_cache) if compiled_cache is not None else 0,
+        "compiled_cache_size": config.database.query_cache_size,
+        "prepared_statement_cache_size": (
+            0 if config.database.pgbouncer else config.database.prepared_statement_cache_size
+        ),
+        "pgbouncer": config.database.pgbouncer,
+    }
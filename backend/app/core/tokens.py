@@ -0,0 +1,63 @@
+"""
+JWT verification with a memo of recently verified tokens.
+
+Clients resend the same access token on every request for its whole
+lifetime, so a successful verification is remembered (keyed by a digest of
+the token, never the token itself) until the token's `exp`. Expired, invalid
+and tampered tokens are never cached and keep raising the same PyJWT errors.
+"""
+import hashlib
+import time
+from typing import Any, Dict
+
+import jwt
+
+from app.core.cache import TTLCache
+from app.core.config import get_config
+
+config = get_config()
+
+
+class TokenVerifier:
+    """Verifies tokens signed with one secret, memoizing the decoded claims"""
+
+    def __init__(self, name: str, secret: str, algorithm: str, max_entries: int, max_ttl: int):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.max_ttl = max_ttl
+        self._cache: TTLCache[Dict[str, Any]] = TTLCache(name, max_entries=max_entries, ttl=max_ttl)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verify a token and return its claims, raising PyJWT errors like jwt.decode"""
+        key = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+
+        payload = self._cache.get(key)
+        if payload is not None:
+            if payload.get("exp", now + 1) > now:
+                return dict(payload)
+            self._cache.invalidate(key)
+
+        payload = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+
+        ttl = min(payload["exp"] - now, self.max_ttl) if "exp" in payload else self.max_ttl
+        if ttl > 0:
+            self._cache.set(key, payload, ttl=ttl)
+        return dict(payload)
+
+
+access_tokens = TokenVerifier(
+    "access_tokens",
+    secret=config.jwt.secret_key,
+    algorithm=config.jwt.algorithm,
+    max_entries=config.auth.token_cache_size,
+    max_ttl=config.jwt.access_token_duration,
+)
+
+refresh_tokens = TokenVerifier(
+    "refresh_tokens",
+    secret=config.jwt.refresh_secret,
+    algorithm=config.jwt.algorithm,
+    max_entries=config.auth.token_cache_size,
+    max_ttl=config.jwt.refresh_token_duration,
+)
@@ -1,16 +1,26 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Keyset pagination of the feed walks (created_at, id) newest first
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        # An author's timeline, newest first; also serves User.posts and the delete cascade
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+        # Recently changed posts
+        Index("ix_posts_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     description: Mapped[str] = mapped_column(String, nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Bumped on every edit, for optimistic concurrency control
+    version = Column(Integer, nullable=False, server_default=text("1"))
     
     # Relationship with user
     author = relationship("User", back_populates="posts")
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Bulk row loading shared by the repositories.
+"""
+from typing import Sequence, Tuple
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def copy_rows(
+    db: AsyncSession, table: Table, columns: Sequence[str], rows: Sequence[Tuple]
+) -> None:
+    """Load rows into a table inside the session's transaction
+
+    Uses COPY (asyncpg copy_records_to_table) on Postgres and an executemany
+    INSERT on other backends.
+    """
+    if not rows:
+        return
+
+    connection = await db.connection()
+    if connection.dialect.driver == "asyncpg":
+        raw = await connection.get_raw_connection()
+        if not raw.driver_connection.is_in_transaction():
+            # The driver adapter begins its transaction lazily on the first
+            # statement; without one, COPY would commit on its own
+            await connection.exec_driver_sql("SELECT 1")
+        # COPY commits or rolls back together with the rest of the unit of work
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=rows, columns=list(columns)
+        )
+    else:
+        await db.execute(
+            insert(table), [dict(zip(columns, row)) for row in rows]
+        )
@@ -1,47 +1,214 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import Sequence
+from sqlalchemy import Float, Integer, Row, String, bindparam, func, insert, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence, Tuple
 from app.models.post import Post
+from app.models.user import User
+from app.repositories.bulk import copy_rows
+
+# Post columns handed back by write statements
+RETURNING_COLUMNS = (Post.id, Post.description, Post.created_at, Post.updated_at, Post.version)
+
+# Everything a feed entry needs, post and author, read in one joined query
+FEED_COLUMNS = (
+    *RETURNING_COLUMNS,
+    User.id.label("author_id"),
+    User.full_name.label("author_full_name"),
+    User.email.label("author_email"),
+)
+
+
+# Generated tsvector column with a GIN index, created by migration 0005 on
+# Postgres only (other backends search in process), so it is not mapped on Post
+SEARCH_VECTOR = literal_column("posts.search_vector", TSVECTOR)
+SEARCH_CONFIG = "english"
+
+# The hot queries below are built once with bound parameters; executing them
+# reuses their memoized cache key instead of building and re-keying a new
+# statement on every call. Keyset-paginated queries come in two variants, for
+# the first page and for pages after a `before` key.
+LIMIT = bindparam("limit", type_=Integer)
+BEFORE_ID = bindparam("before_id", type_=Integer)
+BEFORE_CREATED_AT = tuple_(Post.created_at, Post.id) < tuple_(
+    bindparam("before_created_at", type_=Post.created_at.type), BEFORE_ID
+)
+NEWEST_FIRST = (Post.created_at.desc(), Post.id.desc())
+
+CREATE_POST = insert(Post).returning(*RETURNING_COLUMNS)
+
+EDIT_POST = (
+    update(Post)
+    .where(Post.id == bindparam("post_id"), Post.author_id == bindparam("editor_id"))
+    .values(description=bindparam("new_description"), version=Post.version + 1)
+    .returning(*RETURNING_COLUMNS)
+    .execution_options(synchronize_session=False)
+)
+EDIT_POST_AT_VERSION = EDIT_POST.where(Post.version == bindparam("expected_version"))
+
+FEED_FIRST_PAGE = select(*FEED_COLUMNS).join(Post.author).order_by(*NEWEST_FIRST).limit(LIMIT)
+FEED_NEXT_PAGE = FEED_FIRST_PAGE.where(BEFORE_CREATED_AT)
+
+# Post.author_id rather than with_parent(), which needs a transient User per call
+AUTHOR_FIRST_PAGE = (
+    select(*RETURNING_COLUMNS)
+    .where(Post.author_id == bindparam("author_id"))
+    .order_by(*NEWEST_FIRST)
+    .limit(LIMIT)
+)
+AUTHOR_NEXT_PAGE = AUTHOR_FIRST_PAGE.where(BEFORE_CREATED_AT)
+AUTHOR_POST_COUNT = select(func.count()).select_from(Post).where(Post.author_id == bindparam("author_id"))
+
+_TSQUERY = func.websearch_to_tsquery(SEARCH_CONFIG, bindparam("query", type_=String))
+_RANK = func.ts_rank(SEARCH_VECTOR, _TSQUERY)
+SEARCH_FIRST_PAGE = (
+    select(*FEED_COLUMNS, _RANK.label("rank"))
+    .join(Post.author)
+    .where(SEARCH_VECTOR.op("@@")(_TSQUERY))
+    .order_by(_RANK.desc(), Post.id.desc())
+    .limit(LIMIT)
+)
+SEARCH_NEXT_PAGE = SEARCH_FIRST_PAGE.where(
+    tuple_(_RANK, Post.id) < tuple_(bindparam("before_rank", type_=Float), BEFORE_ID)
+)
+
+
+def _page_params(limit: int, before: Optional[Tuple[datetime, int]]) -> dict:
+    params = {"limit": limit}
+    if before is not None:
+        params["before_created_at"], params["before_id"] = before
+    return params
+
+
+class PostNotFoundError(Exception):
+    """Raised when the post being written does not exist"""
+
+
+class PostVersionConflictError(Exception):
+    """Raised when a post was changed since the version the client edited"""
+
 
 class PostRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create(self, description: str, author_id: int) -> Post:
-        """Create a new post"""
-        post = Post(
-            description = description,
-            author_id = author_id
+    async def create(self, description: str, author_id: int) -> Row:
+        """Create a new post with a single INSERT ... RETURNING"""
+        result = await self.db.execute(
+            CREATE_POST, {"description": description, "author_id": author_id}
         )
+        return result.one()
+    
+    async def create_many(self, posts: Sequence[Tuple[str, int]]) -> Sequence[Row]:
+        """Create many posts from (description, author_id) pairs with one multi-row INSERT ... RETURNING
 
-        self.db.add(post)
-        await self.db.flush()
-        await self.db.refresh(post, ['author'])
+        Returned rows are in the same order as `posts`.
+        """
+        result = await self.db.execute(
+            insert(Post).returning(*RETURNING_COLUMNS, sort_by_parameter_order=True),
+            [{"description": description, "author_id": author_id} for description, author_id in posts]
+        )
+        return result.all()
+    
+    async def bulk_create(self, posts: Sequence[Tuple[str, int]]) -> None:
+        """Load (description, author_id) rows in bulk"""
+        await copy_rows(self.db, Post.__table__, ("description", "author_id"), posts)
 
-        return post
+    async def bulk_create_dated(self, posts: Sequence[Tuple[str, int, datetime]]) -> None:
+        """Load (description, author_id, created_at) rows in bulk, keeping their original dates"""
+        await copy_rows(
+            self.db, Post.__table__,
+            ("description", "author_id", "created_at", "updated_at"),
+            [(description, author_id, created_at, created_at) for description, author_id, created_at in posts]
+        )
     
-    async def get_all_posts(self) -> Sequence[Post]:
-        """Get all posts ordered by creation date (newest first)"""
-                
-        query = select(Post).options(selectinload(Post.author)).order_by(Post.created_at.desc())
-        result = await self.db.execute(query)
-        return result.scalars().all()
+    async def get_posts_page(
+        self, limit: int, before: Optional[Tuple[datetime, int]] = None
+    ) -> Sequence[Row]:
+        """Get a page of feed rows (newest first) strictly older than the `before` sort key"""
+        query = FEED_FIRST_PAGE if before is None else FEED_NEXT_PAGE
+        result = await self.db.execute(query, _page_params(limit, before))
+        return result.all()
     
-    async def edit(self, post_id: int, description: str, author_id: int) -> Post:
-        """Edit post"""
-        query = select(Post).options(selectinload(Post.author)).where(Post.id == post_id)
-        result = await self.db.execute(query)
-        post = result.scalar_one_or_none()
-        
-        if post is None:
-            raise ValueError("Post not found")
+    async def stream_posts(self, batch_size: int = 500) -> AsyncIterator[Row]:
+        """Stream every feed row (newest first) through a server-side cursor"""
+        query = (
+            select(*FEED_COLUMNS)
+            .join(Post.author)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(query)
+        async for row in result:
+            yield row
+
+    async def get_author_posts_page(
+        self, author_id: int, limit: int, before: Optional[Tuple[datetime, int]] = None
+    ) -> Sequence[Row]:
+        """Get a page of one author's posts (newest first) strictly older than the `before` sort key"""
+        query = AUTHOR_FIRST_PAGE if before is None else AUTHOR_NEXT_PAGE
+        result = await self.db.execute(query, {"author_id": author_id, **_page_params(limit, before)})
+        return result.all()
+
+    async def count_author_posts(self, author_id: int) -> int:
+        """Count an author's posts (an index-only scan on the author timeline index)"""
+        result = await self.db.execute(AUTHOR_POST_COUNT, {"author_id": author_id})
+        return result.scalar_one()
+
+    async def search_posts(
+        self, query: str, limit: int, before: Optional[Tuple[float, int]] = None
+    ) -> Sequence[Row]:
+        """Full-text search (Postgres only), best match first, strictly after the `before` (rank, id) key"""
+        params = {"query": query, "limit": limit}
+        if before is not None:
+            params["before_rank"], params["before_id"] = before
+        statement = SEARCH_FIRST_PAGE if before is None else SEARCH_NEXT_PAGE
+        result = await self.db.execute(statement, params)
+        return result.all()
+
+    async def get_feed_rows(self, post_ids: Sequence[int]) -> Sequence[Row]:
+        """Get feed rows for the given post IDs, in no particular order"""
+        result = await self.db.execute(
+            select(*FEED_COLUMNS).join(Post.author).where(Post.id.in_(post_ids))
+        )
+        return result.all()
+
+    async def stream_descriptions(self, batch_size: int = 5000) -> AsyncIterator[Tuple[int, str]]:
+        """Stream (id, description) of every post, for building the in-process search index"""
+        result = await self.db.stream(
+            select(Post.id, Post.description).execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield row.id, row.description
+
+    async def edit(
+        self, post_id: int, description: str, author_id: int, version: Optional[int] = None
+    ) -> Row:
+        """Edit a post owned by `author_id` with a single UPDATE ... RETURNING
+
+        When `version` is given the update only applies if the post is still at it.
+        """
+        params = {"post_id": post_id, "editor_id": author_id, "new_description": description}
+        query = EDIT_POST
+        if version is not None:
+            query = EDIT_POST_AT_VERSION
+            params["expected_version"] = version
+
+        row = (await self.db.execute(query, params)).one_or_none()
+        if row is None:
+            await self._raise_edit_failure(post_id, author_id)
+
+        return row
+
+    async def _raise_edit_failure(self, post_id: int, author_id: int) -> None:
+        """Explain why an edit matched no row (only runs on the failure path)"""
+        result = await self.db.execute(select(Post.author_id).where(Post.id == post_id))
+        owner_id = result.scalar_one_or_none()
+
+        if owner_id is None:
+            raise PostNotFoundError("Post not found")
         
-        if getattr(post, "author_id", None) != author_id:
+        if owner_id != author_id:
             raise PermissionError("Not allowed to edit this post")
         
-        post.description = description
-        await self.db.flush()
-        await self.db.refresh(post)
-
-        return post
\ No newline at end of file
+        raise PostVersionConflictError("Post was modified by another request")
@@ -1,13 +1,20 @@
 """
 User repository implementation.
 """
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, Tuple, Dict, Any, Iterable, Sequence, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import bindparam, select, update, func, and_, or_, desc
 from datetime import datetime
 import uuid
 
 from app.models.user import User
+from app.repositories.bulk import copy_rows
+
+# Hot lookups are built once with bound parameters; executing them reuses
+# their memoized cache key instead of building and re-keying a new select()
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+USER_SUMMARY_BY_ID = select(User.id, User.full_name, User.email).where(User.id == bindparam("user_id"))
 
 
 class UserRepository:
@@ -18,18 +25,19 @@ class UserRepository:
     
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email address"""
-        result = await self.db.execute(
-            select(User).where(User.email == email)
-        )
+        result = await self.db.execute(USER_BY_EMAIL, {"email": email})
         return result.scalar_one_or_none()
 
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
-        result = await self.db.execute(
-            select(User).where(User.id == user_id)
-        )
+        result = await self.db.execute(USER_BY_ID, {"user_id": user_id})
         return result.scalar_one_or_none()
 
+    async def get_summary_by_id(self, user_id: int):
+        """Get only the public summary columns of a user by ID"""
+        result = await self.db.execute(USER_SUMMARY_BY_ID, {"user_id": user_id})
+        return result.one_or_none()
+
     async def create(self, email: str, full_name: str, password_hash : str) -> User:
         """Create a new user"""
         user = User(
@@ -42,4 +50,28 @@ class UserRepository:
         await self.db.flush()
         await self.db.refresh(user)
 
-        return user
\ No newline at end of file
+        return user
+
+    async def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        """Replace the stored password hash of a user"""
+        await self.db.execute(
+            update(User).where(User.id == user_id).values(password_hash=password_hash)
+        )
+
+    async def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Get which of the given emails already belong to a user"""
+        result = await self.db.execute(
+            select(User.email).where(User.email.in_(list(emails)))
+        )
+        return set(result.scalars().all())
+
+    async def get_existing_ids(self, user_ids: Iterable[int]) -> Set[int]:
+        """Get which of the given IDs belong to a user"""
+        result = await self.db.execute(
+            select(User.id).where(User.id.in_(list(user_ids)))
+        )
+        return set(result.scalars().all())
+
+    async def bulk_create(self, users: Sequence[Tuple[str, str, str]]) -> None:
+        """Load (email, full_name, password_hash) rows in bulk"""
+        await copy_rows(self.db, User.__table__, ("email", "full_name", "password_hash"), users)
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from datetime import datetime
+from typing import List, Optional
+
+class UserImportRecord(BaseModel):
+    """One user to import; either a plaintext password or an existing bcrypt hash"""
+    email: EmailStr
+    full_name: str = Field(..., min_length=1)
+    password: Optional[str] = Field(None, min_length=8, max_length=128)
+    password_hash: Optional[str] = Field(None, pattern=r"^\$2[abxy]?\$\d{2}\$")
+
+    @model_validator(mode="after")
+    def check_credentials(self):
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("Exactly one of password or password_hash is required")
+        return self
+
+class PostImportRecord(BaseModel):
+    author_id: int
+    description: str = Field(..., min_length=1)
+    created_at: Optional[datetime] = None
+
+class ImportRejection(BaseModel):
+    line: int
+    error: str
+
+class ImportReport(BaseModel):
+    inserted: int
+    rejected: int
+    elapsed_seconds: float
+    rows_per_second: float
+    # Only the first rejections are listed
+    rejections: List[ImportRejection]
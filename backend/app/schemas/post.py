@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.schemas.user import UserSummary
 
 class PostBase(BaseModel):
@@ -10,12 +10,29 @@ class CreatePost(PostBase):
     pass
 
 class EditPost(PostBase):
-    pass
+    # Version the client last saw; the edit is rejected if the post changed since
+    version: Optional[int] = None
 
 class PostResponse(PostBase):
     id : int
     created_at : datetime
     updated_at: Optional[datetime] = None
+    version: int
     author: UserSummary
 
     model_config = ConfigDict(from_attributes=True)
+
+class PostPage(BaseModel):
+    items: List[PostResponse]
+    next_cursor: Optional[str] = None
+
+class PostSearchResult(PostResponse):
+    rank: float
+
+class PostSearchPage(BaseModel):
+    items: List[PostSearchResult]
+    next_cursor: Optional[str] = None
+
+class AuthorPostPage(PostPage):
+    # Only computed for the first page (no cursor)
+    post_count: Optional[int] = None
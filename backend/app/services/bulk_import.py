@@ -0,0 +1,220 @@
+"""
+Bulk ingestion of users and posts from NDJSON or CSV streams.
+
+CSV input is read line by line, so quoted values may not contain newlines.
+"""
+import asyncio
+import csv
+import json
+import logging
+import time
+from datetime import timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_config
+from app.core.events import invalidation_bus
+from app.core.hashing import password_hasher
+from app.repositories.post import PostRepository
+from app.repositories.user import UserRepository
+from app.schemas.bulk_import import (
+    ImportRejection, ImportReport, PostImportRecord, UserImportRecord
+)
+from app.services.post import POSTS_TOPIC, post_event, posts_committed, rebuild_post_search
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+FORMATS = ("ndjson", "csv")
+
+# (line number, parsed record or None when the line could not be parsed)
+Record = Tuple[int, Optional[Dict]]
+
+
+async def parse_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Record]:
+    """Parse a byte stream of NDJSON lines, or CSV with a header row, into records"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    header: Optional[List[str]] = None
+    line_no = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+
+        if fmt == "ndjson":
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield line_no, record if isinstance(record, dict) else None
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield line_no, None
+        else:
+            yield line_no, {name: value for name, value in zip(header, values) if value != ""}
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8", errors="replace").rstrip("\r")
+
+
+class _ReportBuilder:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.inserted = 0
+        self.rejected = 0
+        self.rejections: List[ImportRejection] = []
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.rejections) < config.bulk_import.max_reported_rejections:
+            self.rejections.append(ImportRejection(line=line, error=error))
+
+    def build(self) -> ImportReport:
+        elapsed = time.perf_counter() - self.started
+        return ImportReport(
+            inserted=self.inserted,
+            rejected=self.rejected,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(self.inserted / elapsed, 1) if elapsed else 0.0,
+            rejections=self.rejections,
+        )
+
+
+class BulkImportService:
+    """Loads validated records in chunks, one transaction per chunk"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.user_repo = UserRepository(db)
+        self.post_repo = PostRepository(db)
+        self.chunk_size = config.bulk_import.chunk_size
+
+    async def import_users(self, records: AsyncIterator[Record]) -> ImportReport:
+        report = _ReportBuilder()
+        async for chunk in self._validated_chunks(records, UserImportRecord, report):
+            existing = await self.user_repo.get_existing_emails(user.email for _, user in chunk)
+
+            accepted: List[Tuple[int, UserImportRecord]] = []
+            seen = set()
+            for line, user in chunk:
+                if user.email in existing or user.email in seen:
+                    report.reject(line, f"Email already exists: {user.email}")
+                    continue
+                seen.add(user.email)
+                accepted.append((line, user))
+
+            hashes = await self._hash_passwords([user for _, user in accepted])
+            rows = [
+                (user.email, user.full_name, password_hash)
+                for (_, user), password_hash in zip(accepted, hashes)
+            ]
+            await self._load(report, accepted, lambda: self.user_repo.bulk_create(rows))
+
+        return report.build()
+
+    async def import_posts(self, records: AsyncIterator[Record]) -> ImportReport:
+        report = _ReportBuilder()
+        async for chunk in self._validated_chunks(records, PostImportRecord, report):
+            authors = await self.user_repo.get_existing_ids(post.author_id for _, post in chunk)
+
+            accepted: List[Tuple[int, PostImportRecord]] = []
+            for line, post in chunk:
+                if post.author_id not in authors:
+                    report.reject(line, f"Unknown author_id: {post.author_id}")
+                else:
+                    accepted.append((line, post))
+
+            undated = [(post.description, post.author_id) for _, post in accepted if post.created_at is None]
+            dated = [
+                (post.description, post.author_id, _naive_utc(post.created_at))
+                for _, post in accepted if post.created_at is not None
+            ]
+            await self._load(report, accepted, lambda: self._bulk_create_posts(undated, dated))
+
+        # Imported posts may land anywhere in the feed
+        event = post_event("imported")
+        await invalidation_bus.publish(self.db, POSTS_TOPIC, **event)
+        await self.db.commit()
+        posts_committed(event)
+        await rebuild_post_search(self.db)
+        return report.build()
+
+    async def _bulk_create_posts(self, undated, dated) -> None:
+        await self.post_repo.bulk_create(undated)
+        await self.post_repo.bulk_create_dated(dated)
+
+    async def _validated_chunks(
+        self, records: AsyncIterator[Record], model: type, report: _ReportBuilder
+    ) -> AsyncIterator[List[Tuple[int, BaseModel]]]:
+        chunk: List[Tuple[int, BaseModel]] = []
+        async for line, record in records:
+            if record is None:
+                report.reject(line, "Malformed record")
+                continue
+            try:
+                chunk.append((line, model.model_validate(record)))
+            except ValidationError as e:
+                report.reject(line, "; ".join(error["msg"] for error in e.errors()))
+                continue
+
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    async def _load(
+        self, report: _ReportBuilder, accepted: List[Tuple[int, BaseModel]], load: Callable[[], Awaitable]
+    ) -> None:
+        """Run a chunk's load and commit it; a failing chunk is rejected as a whole"""
+        try:
+            await load()
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            for line, _ in accepted:
+                report.reject(line, f"Chunk failed: {e}")
+            return
+
+        report.inserted += len(accepted)
+        logger.info(f"Imported {report.inserted} rows ({report.rejected} rejected)")
+
+    async def _hash_passwords(self, users: List[UserImportRecord]) -> List[str]:
+        """Hash plaintext passwords on the hashing pool, keeping existing hashes"""
+        hashes: List[Optional[str]] = [user.password_hash for user in users]
+        todo = [i for i, user in enumerate(users) if user.password_hash is None]
+
+        # Keep exactly one batch per pool worker in flight so the pool never rejects
+        step = min(password_hasher.max_workers, password_hasher.max_pending)
+        for start in range(0, len(todo), step):
+            batch = todo[start:start + step]
+            results = await asyncio.gather(
+                *(password_hasher.hash(users[i].password) for i in batch)
+            )
+            for i, password_hash in zip(batch, results):
+                hashes[i] = password_hash
+        return hashes
+
+
+def _naive_utc(value):
+    """posts timestamps are stored without a time zone, in UTC"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
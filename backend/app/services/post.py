@@ -1,23 +1,276 @@
-from typing import Union, List
-from sqlalchemy import Column
+import asyncio
+import hashlib
+import logging
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, NamedTuple, Union, List, Optional, Set, Tuple
+from sqlalchemy import Column, Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.post import CreatePost, PostResponse, EditPost
+from app.core.batching import WriteCoalescer
+from app.core.broker import Broker
+from app.core.cache import TTLCache
+from app.core.config import get_config
+from app.core.database import db_manager
+from app.core.events import invalidation_bus
+from app.core.pagination import decode_cursor, encode_cursor, decode_rank_cursor, encode_rank_cursor
+from app.core.search import InvertedIndex
+from app.schemas.post import (
+    CreatePost, PostResponse, EditPost, PostPage, AuthorPostPage, PostSearchPage, PostSearchResult
+)
+from app.schemas.user import UserSummary
 from app.repositories.post import PostRepository
 
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+# Serialized feed pages keyed by (limit, cursor). Pages are tagged with the
+# ids of the posts they contain; first pages also carry FEED_HEAD_TAG since
+# they are the only pages a newly created post can appear on.
+FEED_HEAD_TAG = "head"
+
+
+class FeedPageBody(NamedTuple):
+    """A serialized feed page"""
+    body: bytes
+    # Newest updated_at among the page's posts
+    last_modified: Optional[datetime]
+
+
+feed_cache: TTLCache[FeedPageBody] = TTLCache(
+    "feed",
+    max_entries=config.cache.feed_max_entries if config.cache.enabled else 0,
+    ttl=config.cache.feed_ttl,
+)
+
+
+POSTS_TOPIC = "posts"
+
+
+class FeedVersion:
+    """Identifies the state of the feed, for ETags that need no query
+
+    Every post write carries a new version id in its invalidation event.
+    Workers adopt the ids in the order Postgres delivers the events, their
+    own included, so they agree on the version of the same feed. Until a
+    worker has seen the event of a write, including its own, and after
+    events may have been lost, it uses a version of its own, which only
+    costs clients a full response.
+    """
+
+    def __init__(self):
+        self.value = self.new()
+
+    @staticmethod
+    def new() -> str:
+        return uuid.uuid4().hex
+
+    def etag(self, limit: int, cursor: Optional[str]) -> str:
+        key = f"{self.value}:{limit}:{cursor or ''}".encode()
+        return f'"{hashlib.blake2b(key, digest_size=16).hexdigest()}"'
+
+
+feed_version = FeedVersion()
+
+
+def post_event(action: str, **fields) -> dict:
+    """An invalidation event for a post write, with the feed version it produces"""
+    return {"action": action, "feed_version": FeedVersion.new(), **fields}
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def evict_feed(event: dict) -> None:
+    """Drop the cached feed pages made stale by a post write"""
+    if event["action"] == "created":
+        feed_cache.invalidate_tag(FEED_HEAD_TAG)
+    elif event["action"] == "edited":
+        feed_cache.invalidate_tag(post_tag(event["post_id"]))
+    else:
+        feed_cache.clear()
+
+
+# Live feed events (GET /posts/events) of this worker's subscribers
+feed_broker = Broker(
+    queue_size=config.events.queue_size,
+    slow_consumer=config.events.slow_consumer,
+    heartbeat_interval=config.events.heartbeat_interval,
+    max_subscribers=config.events.max_subscribers,
+    replay_size=config.events.replay_size,
+)
+
+# Loads of written posts for feed events, kept referenced until they finish
+_pending_pushes: Set["asyncio.Task[None]"] = set()
+
+
+def push_feed_event(event: dict) -> None:
+    """Push a committed post write to this worker's feed event subscribers"""
+    if not len(feed_broker):
+        # Nobody to load the post for, but the event still takes an id: a
+        # client reconnecting from before it replays a resync instead of
+        # silently missing the write
+        feed_broker.publish("resync", "{}")
+        return
+    if event["action"] == "created":
+        post_ids = event.get("post_ids") or [event["post_id"]]
+        task = asyncio.ensure_future(_push_posts("post_created", post_ids))
+    elif event["action"] == "edited":
+        task = asyncio.ensure_future(_push_posts("post_edited", [event["post_id"]]))
+    else:
+        # Imports and lost invalidations: clients refetch the feed
+        feed_broker.publish("resync", "{}")
+        return
+    _pending_pushes.add(task)
+    task.add_done_callback(_pending_pushes.discard)
+
+
+async def _push_posts(event: str, post_ids: List[int]) -> None:
+    # Loaded once per worker for all its subscribers, from the primary since
+    # a replica may not have the write yet
+    try:
+        async with db_manager.session_factory() as session:
+            rows = await PostRepository(session).get_feed_rows(post_ids)
+    except Exception:
+        logger.exception(f"Error loading posts {post_ids} for feed events")
+        feed_broker.publish("resync", "{}")
+        return
+    for row in sorted(rows, key=lambda row: row.id):
+        feed_broker.publish(event, feed_response(row).model_dump_json())
+
+
+def posts_committed(event: dict) -> None:
+    """React to a committed post write, from this worker or another one"""
+    evict_feed(event)
+    push_feed_event(event)
+    # Until the event comes back through the bus (follow_feed_version); it
+    # may already have, for this worker's own writes
+    if feed_version.value != event.get("feed_version"):
+        feed_version.value = FeedVersion.new()
+
+
+def follow_feed_version(event: dict) -> None:
+    """Adopt the feed version of a write, in the order every worker sees them"""
+    feed_version.value = event.get("feed_version") or FeedVersion.new()
+
+
+async def start_feed_events():
+    if config.events.enabled:
+        await feed_broker.start()
+
+
+async def close_feed_events():
+    await feed_broker.close()
+
+
+invalidation_bus.subscribe(POSTS_TOPIC, posts_committed)
+# After posts_committed, so the version of another worker's write wins
+invalidation_bus.subscribe(POSTS_TOPIC, follow_feed_version, own_events=True)
+
+
+def feed_response(row: Row, model: type = PostResponse, **extra) -> PostResponse:
+    """Build a response from a FEED_COLUMNS row without re-validating database values"""
+    return model.model_construct(
+        id=row.id,
+        description=row.description,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        version=row.version,
+        author=UserSummary.model_construct(
+            id=row.author_id, full_name=row.author_full_name, email=row.author_email
+        ),
+        **extra
+    )
+
+
+# Post search for databases without full-text search of their own. Built at
+# startup and kept current by this worker's writes; Postgres never uses it.
+post_search_index = InvertedIndex()
+search_in_process = False
+
+
+async def init_post_search():
+    """Build the in-process search index if the database cannot search posts itself"""
+    global search_in_process
+    search_in_process = db_manager.engine.dialect.name != "postgresql"
+    if search_in_process:
+        async with db_manager.session_factory() as session:
+            await rebuild_post_search(session)
+
+
+async def rebuild_post_search(session: AsyncSession) -> None:
+    if not search_in_process:
+        return
+    post_search_index.clear()
+    async for post_id, description in PostRepository(session).stream_descriptions():
+        post_search_index.add(post_id, description)
+
+
+def index_posts(posts: List[Tuple[int, str]]) -> None:
+    """Add written (id, description) pairs to the in-process search index"""
+    if search_in_process:
+        for post_id, description in posts:
+            post_search_index.add(post_id, description)
+
+
+async def _create_posts_batch(items: List[Tuple[str, UserSummary]]) -> List[PostResponse]:
+    """Create a batch of posts in one transaction (group commit)"""
+    async with db_manager.session_factory() as session:
+        try:
+            rows = await PostRepository(session).create_many(
+                [(description, author.id) for description, author in items]
+            )
+
+            event = post_event("created", post_ids=[row.id for row in rows])
+            await invalidation_bus.publish(session, POSTS_TOPIC, **event)
+            await session.commit()
+            posts_committed(event)
+        except Exception:
+            await session.rollback()
+            raise
+
+    index_posts([(row.id, description) for row, (description, _) in zip(rows, items)])
+
+    return [
+        PostResponse(**row._mapping, author=author)
+        for row, (_, author) in zip(rows, items)
+    ]
+
+
+# Opt-in coalescer for concurrent post creation
+post_create_batcher: WriteCoalescer[Tuple[str, UserSummary], PostResponse] = WriteCoalescer(
+    _create_posts_batch,
+    max_size=config.posts.batch_max_size,
+    max_wait=config.posts.batch_max_wait_ms / 1000,
+)
+
+
+async def close_post_batcher():
+    await post_create_batcher.close()
+
+
 class PostService():
     def __init__(self, db: AsyncSession):
         self.db = db
         self.post_repo = PostRepository(db)
 
-    async def create_post(self, post_data: CreatePost, author_id):
+    async def create_post(self, post_data: CreatePost, author: UserSummary):
+        if config.posts.batch_enabled:
+            return await post_create_batcher.submit((post_data.description, author))
+
         try:
             post = await self.post_repo.create(            
                 description=post_data.description,
-                author_id=author_id
+                author_id=author.id
             )
 
+            event = post_event("created", post_id=post.id)
+            await invalidation_bus.publish(self.db, POSTS_TOPIC, **event)
             await self.db.commit()
-            return PostResponse.model_validate(post)
+            posts_committed(event)
+            index_posts([(post.id, post.description)])
+            return PostResponse(**post._mapping, author=author)
         
         except Exception as e:
             print(f"Error creating post: {e}")
@@ -25,27 +278,135 @@ class PostService():
             await self.db.rollback()
             raise
 
-    async def get_all_posts(self) -> List[PostResponse]:
-        """Get all posts"""
+    async def get_posts_page(self, limit: int, cursor: Optional[str] = None) -> PostPage:
+        """Get one page of the feed, newest first"""
         try:
-            posts = await self.post_repo.get_all_posts()
-            return [PostResponse.model_validate(post) for post in posts]
+            before = decode_cursor(cursor) if cursor else None
+            # Fetch one extra row to learn whether another page exists
+            rows = await self.post_repo.get_posts_page(limit + 1, before)
+
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                next_cursor = encode_cursor(last.created_at, last.id)
+
+            return PostPage.model_construct(
+                items=[feed_response(row) for row in rows],
+                next_cursor=next_cursor
+            )
         
         except Exception as e:
             print(f"Error fetching posts: {e}")
             raise
 
-    async def edit_post(self, post_id: int, post_data: EditPost, author_id):
+    async def get_author_posts_page(
+        self, author: UserSummary, limit: int, cursor: Optional[str] = None
+    ) -> AuthorPostPage:
+        """Get one page of an author's posts, newest first"""
+        try:
+            before = decode_cursor(cursor) if cursor else None
+            rows = await self.post_repo.get_author_posts_page(author.id, limit + 1, before)
+
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                next_cursor = encode_cursor(last.created_at, last.id)
+
+            # Counting stays off later pages so they cost O(page)
+            post_count = None
+            if cursor is None:
+                post_count = await self.post_repo.count_author_posts(author.id)
+
+            return AuthorPostPage.model_construct(
+                items=[PostResponse.model_construct(**row._mapping, author=author) for row in rows],
+                next_cursor=next_cursor,
+                post_count=post_count
+            )
+        
+        except Exception as e:
+            print(f"Error fetching posts of user {author.id}: {e}")
+            raise
+
+    async def search_posts(self, query: str, limit: int, cursor: Optional[str] = None) -> PostSearchPage:
+        """Full-text search over post descriptions, best match first"""
+        try:
+            before = decode_rank_cursor(cursor) if cursor else None
+            # Fetch one extra result to learn whether another page exists
+            if search_in_process:
+                ranked = post_search_index.search(query, limit + 1, before)
+                rows = {row.id: row for row in await self.post_repo.get_feed_rows([post_id for _, post_id in ranked])}
+                results = [(rank, rows[post_id]) for rank, post_id in ranked if post_id in rows]
+            else:
+                results = [(row.rank, row) for row in await self.post_repo.search_posts(query, limit + 1, before)]
+
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                rank, last = results[-1]
+                next_cursor = encode_rank_cursor(rank, last.id)
+
+            return PostSearchPage.model_construct(
+                items=[feed_response(row, PostSearchResult, rank=rank) for rank, row in results],
+                next_cursor=next_cursor
+            )
+        
+        except Exception as e:
+            print(f"Error searching posts: {e}")
+            raise
+
+    async def get_posts_page_json(self, limit: int, cursor: Optional[str] = None) -> FeedPageBody:
+        """Get one page of the feed as serialized JSON, served from the feed cache when possible
+
+        Take the page's ETag (feed_version.etag) before calling this, so it is
+        never newer than the page.
+        """
+        key = (limit, cursor)
+        cached = feed_cache.get(key)
+        if cached is not None:
+            return cached
+
+        page = await self.get_posts_page(limit, cursor)
+        body = page.model_dump_json().encode()
+        cached = FeedPageBody(
+            body=body,
+            last_modified=max((post.updated_at for post in page.items), default=None),
+        )
+
+        tags = [post_tag(post.id) for post in page.items]
+        if cursor is None:
+            tags.append(FEED_HEAD_TAG)
+        feed_cache.set(key, cached, tags=tags)
+
+        return cached
+
+    async def stream_posts(self) -> AsyncIterator[PostResponse]:
+        """Stream the whole feed one post at a time"""
+        try:
+            async for row in self.post_repo.stream_posts():
+                yield feed_response(row)
+        
+        except Exception as e:
+            print(f"Error streaming posts: {e}")
+            raise
+
+    async def edit_post(self, post_id: int, post_data: EditPost, author: UserSummary):
         try:
             post = await self.post_repo.edit(
                 post_id = post_id,
                 description= post_data.description,
-                author_id= author_id
+                author_id= author.id,
+                version= post_data.version
             )
+            event = post_event("edited", post_id=post_id)
+            await invalidation_bus.publish(self.db, POSTS_TOPIC, **event)
             await self.db.commit()
-            return PostResponse.model_validate(post)
+            posts_committed(event)
+            index_posts([(post.id, post.description)])
+            return PostResponse(**post._mapping, author=author)
         
         except Exception as e:
             print(f"Error editing post {e}")
             await self.db.rollback()
-            raise
\ No newline at end of file
+            raise
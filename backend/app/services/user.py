@@ -1,24 +1,87 @@
 """
 User service layer for handling business logic.
 """
+import math
 import uuid
 import secrets
 import jwt
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
 from app.repositories.user import UserRepository
 from app.models.user import User
 from app.schemas.user import (
-    UserCreate, UserResponse, LoginResponse, LoginRequest
+    UserCreate, UserResponse, UserSummary, LoginResponse, LoginRequest
 )
+from app.core.cache import TTLCache
 from app.core.config import get_config
+from app.core.events import invalidation_bus
+from app.core.hashing import HashingBusyError, password_hasher
+from app.core.rate_limit import SlidingWindowLimiter
 
 config = get_config()
 
+USERS_TOPIC = "users"
+
+# Authenticated principals by user id. Entries never outlive an access token.
+principal_cache: TTLCache[UserSummary] = TTLCache(
+    "principals",
+    max_entries=config.auth.principal_cache_size,
+    ttl=min(config.auth.principal_cache_ttl, config.jwt.access_token_duration),
+)
+
+
+def evict_principal(event: dict) -> None:
+    if event.get("action") == "resync":
+        principal_cache.clear()
+    else:
+        principal_cache.invalidate(event["user_id"])
+
+
+invalidation_bus.subscribe(USERS_TOPIC, evict_principal)
+
+
+# Login attempts per email and per client IP, checked before any database or hashing work
+login_email_limiter = SlidingWindowLimiter(
+    limit=config.auth.login_email_limit,
+    window=config.auth.login_window,
+    max_keys=config.auth.login_limiter_max_keys,
+)
+login_ip_limiter = SlidingWindowLimiter(
+    limit=config.auth.login_ip_limit,
+    window=config.auth.login_window,
+    max_keys=config.auth.login_limiter_max_keys,
+)
+
+# Verified against when the email is unknown, so both kinds of failed login cost the same
+_dummy_hash: Optional[str] = None
+
+
+async def _get_dummy_hash() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await password_hasher.hash(secrets.token_urlsafe(16))
+    return _dummy_hash
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _too_many_attempts(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts, please retry later",
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
+
+
 class UserService:
     """
     User service layer handling all user-related business logic.
@@ -27,20 +90,23 @@ class UserService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.user_repo = UserRepository(db)
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
         try:
-            return self.pwd_context.verify(plain_password, hashed_password)
+            return await password_hasher.verify(plain_password, hashed_password)
+        except HashingBusyError:
+            raise _busy()
         except Exception as e:
             print(f"Error verifying password: {e}")
             return False
     
-    def get_password_hash(self, password: str) -> str:
+    async def get_password_hash(self, password: str) -> str:
         """Generate password hash"""
         try:
-            return self.pwd_context.hash(password)
+            return await password_hasher.hash(password)
+        except HashingBusyError:
+            raise _busy()
         except Exception as e:
             print(f"Error hashing password: {e}")
             raise HTTPException(
@@ -52,14 +118,52 @@ class UserService:
         """Authenticate user with email and password"""
         try:
             user = await self.user_repo.get_by_email(email)
-            if not user or not self.verify_password(password, str(user.password_hash)):
+            if not user:
+                await self.verify_password(password, await _get_dummy_hash())
+                return None
+
+            try:
+                verified, new_hash = await password_hasher.verify_and_update(
+                    password, str(user.password_hash)
+                )
+            except HashingBusyError:
+                raise _busy()
+            if not verified:
                 return None
+
+            if new_hash is not None:
+                await self._rehash(user, new_hash)
             
             return user
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error authenticating user: {e}")
             return None
     
+    async def get_principal(self, user_id: int) -> Optional[UserSummary]:
+        """Get the summary of an authenticated user, served from the principal cache when possible"""
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+
+        row = await self.user_repo.get_summary_by_id(user_id)
+        if row is None:
+            return None
+
+        principal = UserSummary.model_validate(row)
+        principal_cache.set(user_id, principal)
+        return principal
+    
+    async def _rehash(self, user: User, new_hash: str) -> None:
+        """Store a hash made with the current cost; a failure here must not fail the login"""
+        try:
+            await self.user_repo.update_password_hash(user.id, new_hash)
+            await self.db.commit()
+        except Exception as e:
+            print(f"Error rehashing password for user {user.id}: {e}")
+            await self.db.rollback()
+    
     def create_access_token(self, data: dict) -> str:
         """Create JWT access token"""
         to_encode = data.copy()
@@ -89,7 +193,7 @@ class UserService:
                     detail="User with this email already exists"
                 )
             
-            password_hash = self.get_password_hash(user_data.password)
+            password_hash = await self.get_password_hash(user_data.password)
             
             user = await self.user_repo.create(
                 email=user_data.email,
@@ -97,7 +201,10 @@ class UserService:
                 password_hash=password_hash
             )
             
+            event = {"action": "created", "user_id": user.id}
+            await invalidation_bus.publish(self.db, USERS_TOPIC, **event)
             await self.db.commit()
+            evict_principal(event)
             return UserResponse.model_validate(user)
             
         except Exception as e:
@@ -106,8 +213,15 @@ class UserService:
             await self.db.rollback()
             raise
 
-    async def login(self, login_data: LoginRequest) -> LoginResponse:
+    async def login(self, login_data: LoginRequest, client_ip: Optional[str] = None) -> LoginResponse:
         """User login"""
+        email_key = login_data.email.lower()
+        retry_after = login_ip_limiter.hit(client_ip) if client_ip else None
+        if retry_after is None:
+            retry_after = login_email_limiter.hit(email_key)
+        if retry_after is not None:
+            raise _too_many_attempts(retry_after)
+
         try:
             user = await self.authenticate_user(login_data.email, login_data.password)
             if not user:
@@ -115,6 +229,7 @@ class UserService:
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid credentials or user does not exist."
                 )
+            login_email_limiter.reset(email_key)
             
             # Create tokens
             access_token = self.create_access_token(
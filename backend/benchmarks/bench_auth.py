@@ -0,0 +1,51 @@
+"""
+Per-request access token verification overhead, with and without the
+verified-token cache.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_auth [iterations]
+"""
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+
+from app.core.tokens import TokenVerifier
+
+SECRET = "benchmark-secret-key-with-enough-entropy!"
+ALGORITHM = "HS256"
+
+
+def bench(label: str, fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call = (time.perf_counter() - start) / iterations * 1e6
+    print(f"{label:<32} {per_call:8.2f} us/request")
+    return per_call
+
+
+def main(iterations: int) -> None:
+    token = jwt.encode(
+        {
+            "sub": "42",
+            "email": "bench@example.com",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=15),
+        },
+        SECRET,
+        ALGORITHM,
+    )
+    verifier = TokenVerifier("bench_tokens", SECRET, ALGORITHM, max_entries=10000, max_ttl=900)
+
+    baseline = bench(
+        "jwt.decode (uncached)",
+        lambda: jwt.decode(token, SECRET, algorithms=[ALGORITHM]),
+        iterations,
+    )
+    cached = bench("TokenVerifier.decode (cached)", lambda: verifier.decode(token), iterations)
+    print(f"speedup: {baseline / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
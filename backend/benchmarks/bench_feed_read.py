@@ -0,0 +1,92 @@
+"""
+Feed page read cost: ORM hydration versus the column-projection path.
+
+The ORM path is the previous implementation: full Post and User entities
+(selectinload) validated attribute by attribute into PostResponse. The
+projection path is PostRepository.get_posts_page, which selects only the
+response columns in one joined query and builds responses from the rows.
+
+Runs against the configured database (DB_* settings), which must already be
+migrated. Seeds a throwaway author with enough posts for one page.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_feed_read [iterations] [page_size]
+"""
+import asyncio
+import sys
+import time
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.database import db_manager
+from app.models.post import Post
+from app.repositories.post import PostRepository
+from app.repositories.user import UserRepository
+from app.schemas.post import PostPage, PostResponse
+from app.services.post import feed_response
+
+
+async def seed(page_size: int) -> None:
+    async with db_manager.session_factory() as session:
+        user = await UserRepository(session).create(
+            email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+            full_name="Benchmark Author",
+            password_hash="!",
+        )
+        await PostRepository(session).bulk_create(
+            [(f"benchmark post {i}", user.id) for i in range(page_size)]
+        )
+        await session.commit()
+
+
+async def orm_page(page_size: int) -> bytes:
+    async with db_manager.session_factory() as session:
+        result = await session.execute(
+            select(Post)
+            .options(selectinload(Post.author))
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(page_size)
+        )
+        posts = result.scalars().all()
+        page = PostPage(items=[PostResponse.model_validate(post) for post in posts])
+        return page.model_dump_json().encode()
+
+
+async def projection_page(page_size: int) -> bytes:
+    async with db_manager.session_factory() as session:
+        rows = await PostRepository(session).get_posts_page(page_size)
+        page = PostPage.model_construct(items=[feed_response(row) for row in rows], next_cursor=None)
+        return page.model_dump_json().encode()
+
+
+async def bench(label: str, fn, iterations: int, page_size: int) -> float:
+    await fn(page_size)  # warm up the pool and statement caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn(page_size)
+    per_page = (time.perf_counter() - start) / iterations * 1000
+    print(f"{label:<28} {per_page:8.3f} ms/page")
+    return per_page
+
+
+async def main(iterations: int, page_size: int) -> None:
+    await db_manager.initialize()
+    try:
+        await seed(page_size)
+        if await orm_page(page_size) != await projection_page(page_size):
+            raise SystemExit("ORM and projection paths returned different pages")
+
+        baseline = await bench("ORM + model_validate", orm_page, iterations, page_size)
+        projected = await bench("column projection", projection_page, iterations, page_size)
+        print(f"speedup: {baseline / projected:.1f}x")
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    ))
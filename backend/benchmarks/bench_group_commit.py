@@ -0,0 +1,77 @@
+"""
+Throughput of concurrent post creation with and without group commit.
+
+Runs against the configured database (DB_* settings), which must already be
+migrated. Creates a throwaway author and leaves the inserted posts behind.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_group_commit [posts] [concurrency]
+"""
+import asyncio
+import sys
+import time
+import uuid
+
+from app.core.config import get_config
+from app.core.database import db_manager
+from app.repositories.user import UserRepository
+from app.schemas.post import CreatePost
+from app.schemas.user import UserSummary
+from app.services.post import PostService, post_create_batcher
+
+config = get_config()
+
+
+async def create_author() -> UserSummary:
+    async with db_manager.session_factory() as session:
+        user = await UserRepository(session).create(
+            email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+            full_name="Benchmark Author",
+            password_hash="!",
+        )
+        await session.commit()
+        return UserSummary.model_validate(user)
+
+
+async def run(label: str, author: UserSummary, posts: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create(i: int) -> None:
+        async with semaphore:
+            # One session per call, as each HTTP request would have
+            async with db_manager.session_factory() as session:
+                await PostService(session).create_post(
+                    CreatePost(description=f"benchmark post {i}"), author
+                )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(create(i) for i in range(posts)))
+    rate = posts / (time.perf_counter() - start)
+    print(f"{label:<28} {rate:10.0f} posts/s")
+    return rate
+
+
+async def main(posts: int, concurrency: int) -> None:
+    await db_manager.initialize()
+    try:
+        author = await create_author()
+
+        config.posts.batch_enabled = False
+        baseline = await run("one commit per post", author, posts, concurrency)
+
+        config.posts.batch_enabled = True
+        batched = await run(
+            f"group commit (<= {post_create_batcher.max_size})", author, posts, concurrency
+        )
+        await post_create_batcher.close()
+
+        print(f"speedup: {batched / baseline:.1f}x")
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    ))
@@ -0,0 +1,103 @@
+"""
+Post search latency over a seeded corpus: substring scan (ILIKE) versus
+Postgres full-text search, and the in-process inverted index used on other
+backends.
+
+Runs against the configured database (DB_* settings), which must be
+migrated to head. The corpus is loaded in a transaction that is rolled back
+at the end, so nothing is left behind.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_search [posts] [repeats]
+"""
+import asyncio
+import itertools
+import random
+import sys
+import time
+import uuid
+
+from sqlalchemy import select, text
+
+from app.core.database import db_manager
+from app.core.search import InvertedIndex
+from app.models.post import Post
+from app.repositories.post import PostRepository
+from app.repositories.user import UserRepository
+
+VOCABULARY = [f"word{rank}" for rank in range(1, 20001)]
+# Zipf-like word frequencies, as in natural text
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+WORDS_PER_POST = 12
+
+QUERIES = {
+    "common word": "word10",
+    "mid-frequency word": "word500",
+    "rare word": "word15000",
+    "two words": "word50 word700",
+}
+
+
+def build_corpus(posts: int) -> list:
+    rng = random.Random(42)
+    return [
+        " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=WORDS_PER_POST))
+        for _ in range(posts)
+    ]
+
+
+async def timed(fn, repeats: int) -> float:
+    await fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        await fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+async def main(posts: int, repeats: int) -> None:
+    corpus = build_corpus(posts)
+    await db_manager.initialize()
+    try:
+        async with db_manager.session_factory() as db:
+            repo = PostRepository(db)
+            author = await UserRepository(db).create(
+                email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+                full_name="Benchmark Author",
+                password_hash="!",
+            )
+
+            start = time.perf_counter()
+            await repo.bulk_create([(description, author.id) for description in corpus])
+            await db.execute(text("ANALYZE posts"))
+            print(f"seeded {posts} posts in {time.perf_counter() - start:.1f} s")
+
+            start = time.perf_counter()
+            index = InvertedIndex()
+            async for post_id, description in repo.stream_descriptions():
+                index.add(post_id, description)
+            print(f"built in-process index in {time.perf_counter() - start:.1f} s\n")
+
+            print(f"{'query':<20} {'ILIKE scan':>12} {'tsvector+GIN':>14} {'in-process':>12}")
+            for label, query in QUERIES.items():
+                patterns = [Post.description.ilike(f"%{word}%") for word in query.split()]
+                ilike = await timed(lambda: db.execute(
+                    select(Post.id).where(*patterns).order_by(Post.id.desc()).limit(20)
+                ), repeats)
+                fts = await timed(lambda: repo.search_posts(query, 20), repeats)
+                in_process = await timed(lambda: _search(index, query), repeats)
+                print(f"{label:<20} {ilike:>10.2f}ms {fts:>12.2f}ms {in_process:>10.2f}ms")
+
+            await db.rollback()
+    finally:
+        await db_manager.close()
+
+
+async def _search(index: InvertedIndex, query: str):
+    return index.search(query, 20)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    ))
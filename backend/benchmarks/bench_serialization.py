@@ -0,0 +1,73 @@
+"""
+Per-item CPU cost of serializing a large feed: FastAPI's response_model
+handling versus ModelJSONResponse.
+
+The response_model path is what FastAPI runs for an endpoint returning a
+List[PostResponse]: dump to Python objects, validate against the model
+again, then JSONResponse encodes the result. No database is needed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_serialization [items] [rounds]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import ModelJSONResponse
+from app.schemas.post import PostResponse
+from app.schemas.user import UserSummary
+
+
+def build_feed(items: int) -> List[PostResponse]:
+    now = datetime.utcnow()
+    author = UserSummary(id=1, full_name="Benchmark Author", email="bench@example.com")
+    return [
+        PostResponse(
+            id=i, description=f"benchmark post {i} " * 8,
+            created_at=now, updated_at=now, version=1, author=author,
+        )
+        for i in range(items)
+    ]
+
+
+async def response_model_body(field, feed: List[PostResponse]) -> bytes:
+    content = await serialize_response(field=field, response_content=feed)
+    return JSONResponse(content).body
+
+
+async def main(items: int, rounds: int) -> None:
+    feed = build_feed(items)
+    field = create_response_field("Response_bench", List[PostResponse], mode="serialization")
+
+    results = {}
+    for label, render in (
+        ("response_model (FastAPI)", lambda: response_model_body(field, feed)),
+        ("ModelJSONResponse", lambda: _fast_body(feed)),
+    ):
+        await render()  # warm up
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await render()
+        per_item = (time.perf_counter() - start) / (rounds * items) * 1e6
+        results[label] = per_item
+        print(f"{label:<28} {per_item:8.2f} us/item")
+
+    baseline, fast = results.values()
+    print(f"reduction: {(1 - fast / baseline) * 100:.0f}% ({baseline / fast:.1f}x)")
+
+
+async def _fast_body(feed: List[PostResponse]) -> bytes:
+    return ModelJSONResponse(feed, List[PostResponse]).body
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    ))
@@ -0,0 +1,121 @@
+"""
+Per-query overhead of rebuilt versus pre-built repository statements.
+
+The rebuilt path is the previous implementation: a new select() per call,
+which SQLAlchemy must walk to compute its cache key before it can reuse the
+compiled SQL. The pre-built path is the current repository, whose statements
+carry a memoized cache key. Both also run with asyncpg's prepared statement
+cache disabled (as in DB_PGBOUNCER mode), which prepares every statement
+again on each execution.
+
+Runs against the configured database (DB_* settings), which must already be
+migrated. Creates a throwaway author with a few posts.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_statement_cache [iterations]
+"""
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import get_config
+from app.models.post import Post
+from app.models.user import User
+from app.repositories.post import FEED_COLUMNS, FEED_NEXT_PAGE, PostRepository
+from app.repositories.user import USER_BY_EMAIL, UserRepository
+
+config = get_config()
+
+PAGE_SIZE = 20
+
+
+def rebuilt_user_by_email(email: str):
+    return select(User).where(User.email == email)
+
+
+def rebuilt_feed_next_page(before):
+    return (
+        select(*FEED_COLUMNS)
+        .join(Post.author)
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(PAGE_SIZE)
+        .where(tuple_(Post.created_at, Post.id) < tuple_(*before))
+    )
+
+
+def python_overhead(label: str, build, iterations: int) -> float:
+    """Cost of producing a statement's cache key, the part a pre-built statement skips"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build()._generate_cache_key()
+    per_call = (time.perf_counter() - start) / iterations * 1e6
+    print(f"{label:<44} {per_call:8.1f} us/statement")
+    return per_call
+
+
+async def bench(label: str, session: AsyncSession, fn, iterations: int) -> float:
+    await fn(session)  # warm up the statement caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn(session)
+    per_query = (time.perf_counter() - start) / iterations * 1e6
+    print(f"{label:<44} {per_query:8.1f} us/query")
+    return per_query
+
+
+async def seed(session: AsyncSession) -> str:
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    user = await UserRepository(session).create(email=email, full_name="Benchmark Author", password_hash="!")
+    await PostRepository(session).bulk_create([(f"benchmark post {i}", user.id) for i in range(PAGE_SIZE)])
+    await session.commit()
+    return email
+
+
+async def run_engine(label: str, prepared_cache_size: int, iterations: int, email: str) -> None:
+    engine = create_async_engine(
+        config.database.database_url,
+        connect_args={"prepared_statement_cache_size": prepared_cache_size},
+    )
+    before = (datetime.utcnow(), 2 ** 31 - 1)
+    try:
+        async with AsyncSession(engine) as session:
+            print(f"-- {label}")
+            await bench("get_by_email, rebuilt select()", session,
+                        lambda s: s.execute(rebuilt_user_by_email(email)), iterations)
+            await bench("get_by_email, pre-built", session,
+                        lambda s: UserRepository(s).get_by_email(email), iterations)
+            await bench("feed next page, rebuilt select()", session,
+                        lambda s: s.execute(rebuilt_feed_next_page(before)), iterations)
+            await bench("feed next page, pre-built", session,
+                        lambda s: PostRepository(s).get_posts_page(PAGE_SIZE, before), iterations)
+    finally:
+        await engine.dispose()
+
+
+async def main(iterations: int) -> None:
+    before = (datetime.utcnow(), 2 ** 31 - 1)
+    print("-- statement construction and cache key (no database)")
+    python_overhead("user by email, rebuilt", lambda: rebuilt_user_by_email("a@example.com"), iterations * 10)
+    python_overhead("user by email, pre-built", lambda: USER_BY_EMAIL, iterations * 10)
+    python_overhead("feed next page, rebuilt", lambda: rebuilt_feed_next_page(before), iterations * 10)
+    python_overhead("feed next page, pre-built", lambda: FEED_NEXT_PAGE, iterations * 10)
+
+    engine = create_async_engine(config.database.database_url)
+    async with AsyncSession(engine) as session:
+        email = await seed(session)
+    await engine.dispose()
+
+    await run_engine(
+        f"prepared statement cache {config.database.prepared_statement_cache_size}",
+        config.database.prepared_statement_cache_size, iterations, email,
+    )
+    await run_engine("prepared statement cache off (PgBouncer mode)", 0, iterations, email)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,162 @@
+"""
+Check that the repository queries are served by indexes.
+
+Runs each hot repository query against the configured database (DB_*
+settings), captures the SQL it sends and EXPLAINs it with sequential scans
+disabled, so any Seq Scan left in a plan means no index can serve that query.
+Everything runs in one transaction that is rolled back, including the rows
+created by --seed. Exits with status 1 when a plan uses a sequential scan.
+
+Usage (from the backend directory, after `alembic upgrade head`):
+    python check_query_plans.py --seed 10000
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Tuple
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import db_manager
+from app.models.post import Post
+from app.models.user import User
+from app.repositories.post import PostRepository
+from app.repositories.user import UserRepository
+
+POSTS_PER_AUTHOR = 50
+
+
+class Sample(NamedTuple):
+    """Existing row values to parameterize the checked queries with"""
+    post_id: int
+    author_id: int
+    email: str
+    created_at: object
+    version: int
+
+
+async def _stream_first(db: AsyncSession, s: Sample) -> None:
+    stream = PostRepository(db).stream_posts()
+    await stream.__anext__()
+    await stream.aclose()
+
+
+async def _author_posts(db: AsyncSession, s: Sample) -> None:
+    user = await UserRepository(db).get_by_id(s.author_id)
+    await db.refresh(user, ["posts"])
+
+
+CHECKS: Dict[str, Callable[[AsyncSession, Sample], Awaitable]] = {
+    "feed first page": lambda db, s: PostRepository(db).get_posts_page(20),
+    "feed next page": lambda db, s: PostRepository(db).get_posts_page(20, (s.created_at, s.post_id)),
+    "feed stream": _stream_first,
+    "edit post": lambda db, s: PostRepository(db).edit(s.post_id, "plan check", s.author_id, s.version),
+    "author timeline first page": lambda db, s: PostRepository(db).get_author_posts_page(s.author_id, 20),
+    "author timeline next page": lambda db, s: PostRepository(db).get_author_posts_page(
+        s.author_id, 20, (s.created_at, s.post_id)
+    ),
+    "author post count": lambda db, s: PostRepository(db).count_author_posts(s.author_id),
+    "author posts (User.posts)": _author_posts,
+    "post search": lambda db, s: PostRepository(db).search_posts("plan check post", 20),
+    "user by email": lambda db, s: UserRepository(db).get_by_email(s.email),
+    "user summary by id": lambda db, s: UserRepository(db).get_summary_by_id(s.author_id),
+}
+
+
+async def seed(db: AsyncSession, posts: int) -> None:
+    authors = max(1, posts // POSTS_PER_AUTHOR)
+    await UserRepository(db).bulk_create(
+        [(f"plan-check-{i}@example.com", f"Plan Check {i}", "!") for i in range(authors)]
+    )
+    result = await db.execute(
+        select(User.id).where(User.email.like("plan-check-%@example.com"))
+    )
+    author_ids = result.scalars().all()
+    await PostRepository(db).bulk_create(
+        [(f"plan check post {i}", author_ids[i % len(author_ids)]) for i in range(posts)]
+    )
+    await db.execute(text("ANALYZE users"))
+    await db.execute(text("ANALYZE posts"))
+
+
+async def load_sample(db: AsyncSession) -> Sample:
+    result = await db.execute(
+        select(Post.id, Post.author_id, User.email, Post.created_at, Post.version)
+        .join(Post.author)
+        .order_by(Post.id.desc())
+        .limit(1)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise SystemExit("No posts to check against; run with --seed")
+    return Sample(*row)
+
+
+def seq_scans(plan: dict) -> List[str]:
+    """Relations read by a sequential scan anywhere in a JSON plan"""
+    found = [plan["Relation Name"]] if plan["Node Type"] == "Seq Scan" else []
+    for child in plan.get("Plans", ()):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def main(posts: int, verbose: bool) -> int:
+    await db_manager.initialize()
+    failures = 0
+    try:
+        async with db_manager.session_factory() as db:
+            connection = await db.connection()
+            if connection.dialect.name != "postgresql":
+                raise SystemExit("Query plan checks need PostgreSQL")
+            driver = (await connection.get_raw_connection()).driver_connection
+
+            captured: List[Tuple[str, tuple]] = []
+            event.listen(
+                connection.sync_connection, "before_cursor_execute",
+                lambda conn, cursor, statement, parameters, context, executemany:
+                    captured.append((statement, parameters))
+            )
+
+            if posts:
+                await seed(db, posts)
+            sample = await load_sample(db)
+            await db.execute(text("SET LOCAL enable_seqscan = off"))
+
+            for name, check in CHECKS.items():
+                captured.clear()
+                await check(db, sample)
+                for i, (statement, parameters) in enumerate(captured, 1):
+                    label = f"{name} [{i}]" if len(captured) > 1 else name
+                    explained = await driver.fetchval(
+                        f"EXPLAIN (FORMAT JSON) {statement}", *parameters
+                    )
+                    # SQLAlchemy registers a json codec on its asyncpg connections
+                    if isinstance(explained, str):
+                        explained = json.loads(explained)
+                    plan = explained[0]["Plan"]
+                    scanned = seq_scans(plan)
+                    failures += bool(scanned)
+                    status = f"SEQ SCAN on {', '.join(scanned)}" if scanned else "ok"
+                    print(f"{label:<32} {status}")
+                    if verbose or scanned:
+                        print(f"    {' '.join(statement.split())}")
+
+            await db.rollback()
+    finally:
+        await db_manager.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flag repository queries that need a sequential scan")
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Insert this many throwaway posts (rolled back) before checking"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print every checked statement")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.seed, args.verbose)))
@@ -0,0 +1,58 @@
+"""
+Bulk import users or posts from an NDJSON or CSV file.
+
+Usage (from the backend directory):
+    python import_data.py users users.ndjson
+    python import_data.py posts posts.csv --format csv
+"""
+import argparse
+import asyncio
+import logging
+from typing import AsyncIterator
+
+from app.core.database import db_manager
+from app.core.hashing import close_password_hasher
+from app.services.bulk_import import FORMATS, BulkImportService, parse_records
+
+READ_SIZE = 1 << 20
+
+
+async def read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, READ_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def main(entity: str, path: str, fmt: str) -> None:
+    await db_manager.initialize()
+    try:
+        async with db_manager.session_factory() as session:
+            service = BulkImportService(session)
+            records = parse_records(read_chunks(path), fmt)
+            if entity == "users":
+                report = await service.import_users(records)
+            else:
+                report = await service.import_posts(records)
+    finally:
+        await db_manager.close()
+        close_password_hasher()
+
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users or posts")
+    parser.add_argument("entity", choices=("users", "posts"))
+    parser.add_argument("path", help="NDJSON or CSV file to import")
+    parser.add_argument(
+        "--format", choices=FORMATS, default=None,
+        help="Input format (default: from the file extension, else ndjson)"
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(main(args.entity, args.path, fmt))
@@ -1,9 +1,17 @@
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.middleware import MetricsMiddleware, QueryProfilerMiddleware, ReadYourWritesMiddleware
 from app.core.config import get_config
 from app.core.database import init_database, close_database
+from app.core.events import start_invalidation_bus, stop_invalidation_bus
+from app.core.hashing import close_password_hasher
+from app.core.metrics import start_request_metrics, stop_request_metrics
+from app.services.post import close_feed_events, close_post_batcher, init_post_search, start_feed_events
+
+logger = logging.getLogger(__name__)
 
 config = get_config()
 
@@ -20,6 +28,21 @@ try:
     AVAILABLE_ROUTERS.append(("posts", posts_router, "", ["posts"]))
 except ImportError as e:
     ROUTER_ERRORS.append(f"posts: {e}")
+try:
+    from app.api.routes.users import router as users_router
+    AVAILABLE_ROUTERS.append(("users", users_router, "/users", ["users"]))
+except ImportError as e:
+    ROUTER_ERRORS.append(f"users: {e}")
+try:
+    from app.api.routes.admin import router as admin_router
+    AVAILABLE_ROUTERS.append(("admin", admin_router, "/admin", ["admin"]))
+except ImportError as e:
+    ROUTER_ERRORS.append(f"admin: {e}")
+try:
+    from app.api.routes.metrics import router as metrics_router
+    AVAILABLE_ROUTERS.append(("metrics", metrics_router, "/metrics", ["metrics"]))
+except ImportError as e:
+    ROUTER_ERRORS.append(f"metrics: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -35,12 +58,58 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Database initialization failed: {e}")
         raise
+
+    try:
+        await init_post_search()
+    except Exception as e:
+        print(f"Post search initialization failed: {e}")
+        raise
+
+    try:
+        await start_invalidation_bus()
+    except Exception as e:
+        print(f"Invalidation bus failed to start: {e}")
+        raise
+
+    try:
+        await start_request_metrics()
+    except Exception:
+        logger.exception("Request metrics failed to start")
+        raise
+
+    try:
+        await start_feed_events()
+    except Exception:
+        logger.exception("Feed events failed to start")
+        raise
     
     print(f"Application started successfully")
 
     yield
     
     # Shutdown
+    try:
+        await close_feed_events()
+    except Exception:
+        logger.exception("Feed events shutdown error")
+
+    try:
+        await stop_request_metrics()
+    except Exception:
+        logger.exception("Request metrics shutdown error")
+
+    try:
+        await close_post_batcher()
+    except Exception as e:
+        print(f"Post batcher shutdown error: {e}")
+
+    try:
+        await stop_invalidation_bus()
+    except Exception as e:
+        print(f"Invalidation bus shutdown error: {e}")
+
+    close_password_hasher()
+
     try:
         await close_database()
     except Exception as e:
@@ -60,12 +129,21 @@ app = FastAPI(
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=config.server.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+app.add_middleware(ReadYourWritesMiddleware)
+
+if config.profiler.enabled:
+    app.add_middleware(QueryProfilerMiddleware)
+
+# Outermost, so request timings include the other middleware
+if config.metrics.enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include available routers
 for name, router, prefix, tags in AVAILABLE_ROUTERS:
     app.include_router(router, prefix=prefix, tags=tags)
@@ -80,5 +158,6 @@ if __name__ == "__main__":
         host=config.server.host,
         port=config.server.port,
         reload=config.is_development(),
-        workers=1 if config.is_development() else config.server.workers
+        workers=1 if config.is_development() else config.server.workers,
+        timeout_graceful_shutdown=config.server.shutdown_timeout,
     )
\ No newline at end of file
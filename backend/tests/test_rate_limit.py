@@ -0,0 +1,45 @@
+from app.core import rate_limit
+from app.core.rate_limit import SlidingWindowLimiter
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_limiter(monkeypatch, clock: FakeClock, **kwargs) -> SlidingWindowLimiter:
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return SlidingWindowLimiter(**kwargs)
+
+
+def test_saturated_key_survives_flood_of_new_keys(monkeypatch):
+    clock = FakeClock()
+    limiter = make_limiter(monkeypatch, clock, limit=5, window=60, max_keys=100)
+
+    for _ in range(5):
+        assert limiter.hit("victim@example.com") is None
+    assert limiter.hit("victim@example.com") is not None
+
+    # Spread over many sources, junk keys must not evict the victim's count
+    refused = [limiter.hit(f"junk{i}@example.com") for i in range(10_000)]
+    assert sum(retry_after is not None for retry_after in refused) == 10_000 - 99
+
+    assert limiter.hit("victim@example.com") is not None
+    assert len(limiter) == 100
+
+
+def test_new_keys_are_accepted_once_stale_keys_expire(monkeypatch):
+    clock = FakeClock()
+    limiter = make_limiter(monkeypatch, clock, limit=5, window=60, max_keys=2)
+
+    assert limiter.hit("a") is None
+    assert limiter.hit("b") is None
+    assert limiter.hit("c") is not None
+
+    # Two windows later "a" and "b" no longer count against anything
+    clock.now += 120
+    assert limiter.hit("c") is None
+    assert len(limiter) == 1
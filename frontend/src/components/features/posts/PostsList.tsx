@@ -10,7 +10,7 @@ import {
 } from '@mui/material';
 import { Refresh as RefreshIcon, Add as AddIcon } from '@mui/icons-material';
 import { PostCard } from './PostCard';
-import { usePosts } from '../../../hooks/usePosts';
+import { usePosts, usePostEvents } from '../../../hooks/usePosts';
 import type { PostResponse } from '../../../types';
 
 interface PostsListProps {
@@ -108,6 +108,7 @@ export const PostsList: React.FC<PostsListProps> = ({
   onCreatePost,
 }) => {
   const { posts, isLoading, error, refreshPosts, clearError } = usePosts();
+  usePostEvents();
 
   // Load posts on component mount - removed unnecessary useEffect since usePosts already handles this
 
@@ -12,6 +12,7 @@ export const API_CONFIG = {
       LIST: '/posts',
       CREATE: '/posts',
       EDIT: (postId: string) => `/posts/${postId}`,
+      EVENTS: '/posts/events',
     },
   },
 } as const;
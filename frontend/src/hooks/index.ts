@@ -2,7 +2,7 @@
 export { useAuth, useRequireAuth, useRequireGuest } from './useAuth';
 
 // Posts hooks
-export { usePosts, usePost } from './usePosts';
+export { usePosts, usePost, usePostEvents } from './usePosts';
 
 // Form management hooks
 export { useForm } from './useForm';
\ No newline at end of file
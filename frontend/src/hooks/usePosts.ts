@@ -1,5 +1,6 @@
 import { useEffect, useCallback, useRef } from 'react';
 import { usePostsStore, usePostById } from '../store';
+import { postsService } from '../services/api';
 import type { CreatePostRequest, PostResponse } from '../types';
 
 interface UsePostsReturn {
@@ -107,6 +108,20 @@ export const usePosts = (): UsePostsReturn => {
   };
 };
 
+// Hook for live feed updates (new and edited posts) instead of polling;
+// use it once, in the component that shows the feed
+export const usePostEvents = () => {
+  const upsertPost = usePostsStore(state => state.upsertPost);
+  const refresh = usePostsStore(state => state.refresh);
+
+  useEffect(() => {
+    return postsService.subscribeToEvents({
+      onPost: upsertPost,
+      onResync: () => { refresh(); },
+    });
+  }, [upsertPost, refresh]);
+};
+
 // Hook for managing a specific post
 export const usePost = (postId: number) => {
   const post = usePostById(postId);
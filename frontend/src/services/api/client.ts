@@ -15,6 +15,8 @@ class ApiClient {
     this.client = axios.create({
       baseURL: API_CONFIG.BASE_URL,
       timeout: API_CONFIG.TIMEOUT,
+      // Sends the cookie that keeps reads on the primary right after a write
+      withCredentials: true,
       headers: {
         'Content-Type': 'application/json',
       },
@@ -10,6 +10,7 @@ export type {
   LoginResponse,
   TokenResponse,
   PostResponse,
+  PostPage,
   CreatePostRequest,
   UserResponse,
 } from '../../types/api.types';
\ No newline at end of file
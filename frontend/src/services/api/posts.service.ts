@@ -1,20 +1,19 @@
 import { apiClient } from './client';
 import { API_CONFIG } from '../../config/constants';
-import type { PostResponse, CreatePostRequest } from '../../types/api.types';
+import type { PostResponse, PostPage, CreatePostRequest } from '../../types/api.types';
+
+export interface PostEventHandlers {
+  onPost: (post: PostResponse) => void;
+  onResync: () => void;
+}
 
 export class PostsService {
   /**
-   * Get all posts
+   * Get the first page of the feed
    */
   async getAllPosts(): Promise<PostResponse[]> {
-    try {
-      const response = await apiClient.get<PostResponse[]>(
-        API_CONFIG.ENDPOINTS.POSTS.LIST
-      );
-      return response;
-    } catch (error) {
-      throw apiClient.handleError(error);
-    }
+    const { items } = await this.getPostsPage();
+    return items;
   }
 
   /**
@@ -45,32 +44,40 @@ export class PostsService {
   }
 
   /**
-   * Get posts with pagination (for future infinite scroll)
+   * Get one page of posts, continuing from the cursor of the previous page
    */
-  async getPostsPaginated(page = 1, limit = 10): Promise<{
-    posts: PostResponse[];
-    hasMore: boolean;
-    total: number;
-  }> {
+  async getPostsPage(cursor?: string | null, limit = 20): Promise<PostPage> {
     try {
-      // For now, this returns all posts since the API doesn't support pagination yet
-      // This structure is prepared for future pagination implementation
-      const posts = await this.getAllPosts();
-      
-      const startIndex = (page - 1) * limit;
-      const endIndex = startIndex + limit;
-      const paginatedPosts = posts.slice(startIndex, endIndex);
-      
-      return {
-        posts: paginatedPosts,
-        hasMore: endIndex < posts.length,
-        total: posts.length,
-      };
+      const response = await apiClient.get<PostPage>(
+        API_CONFIG.ENDPOINTS.POSTS.LIST,
+        { params: { limit, ...(cursor ? { cursor } : {}) } }
+      );
+      return response;
     } catch (error) {
       throw apiClient.handleError(error);
     }
   }
 
+  /**
+   * Receive new and edited posts as they happen (Server-Sent Events).
+   * The browser reconnects on its own; returns a function that closes the stream.
+   */
+  subscribeToEvents(handlers: PostEventHandlers): () => void {
+    const source = new EventSource(
+      `${API_CONFIG.BASE_URL}${API_CONFIG.ENDPOINTS.POSTS.EVENTS}`
+    );
+    const handlePost = (event: MessageEvent<string>) => {
+      handlers.onPost(JSON.parse(event.data) as PostResponse);
+    };
+
+    source.addEventListener('post_created', handlePost);
+    source.addEventListener('post_edited', handlePost);
+    // Sent when events were missed, e.g. after falling behind or reconnecting
+    source.addEventListener('resync', () => handlers.onResync());
+
+    return () => source.close();
+  }
+
   /**
    * Search posts by content (client-side filtering for now)
    */
@@ -16,6 +16,7 @@ interface PostsActions {
   // State management actions
   setPosts: (posts: PostResponse[]) => void;
   addPost: (post: PostResponse) => void;
+  upsertPost: (post: PostResponse) => void;
   editPost: (postId: number, updates: PostResponse) => void;
   removePost: (postId: number) => void;
   
@@ -40,6 +41,7 @@ const initialState: PostsState = {
   error: null,
   hasMore: true,
   page: 1,
+  nextCursor: null,
 };
 
 export const usePostsStore = create<PostsStore>((set, get) => ({
@@ -53,16 +55,15 @@ export const usePostsStore = create<PostsStore>((set, get) => ({
     set({ isLoading: true, error: null });
     
     try {
-      const posts = await postsService.getAllPosts();
+      const { items: posts, next_cursor } = await postsService.getPostsPage();
       
       set({
-        posts: posts.sort((a, b) => 
-          new Date(b.created_at).getTime() - new Date(a.created_at).getTime()
-        ),
+        posts,
         isLoading: false,
         error: null,
-        hasMore: false, // All posts loaded at once
+        hasMore: next_cursor !== null,
         page: 1,
+        nextCursor: next_cursor,
       });
     } catch (error) {
       const apiError = error as ApiError;
@@ -131,6 +132,19 @@ export const usePostsStore = create<PostsStore>((set, get) => ({
     set({ posts: [post, ...posts] });
   },
 
+  upsertPost: (post: PostResponse) => {
+    const { posts } = get();
+    if (posts.some((existing: PostResponse) => existing.id === post.id)) {
+      set({
+        posts: posts.map((existing: PostResponse) =>
+          existing.id === post.id ? post : existing
+        ),
+      });
+    } else {
+      set({ posts: [post, ...posts] });
+    }
+  },
+
   editPost: async (postId: number, updates: CreatePostRequest): Promise<PostResponse> => {
     set({ isLoading: true, error: null });
     try {
@@ -166,24 +180,25 @@ export const usePostsStore = create<PostsStore>((set, get) => ({
     set({ error: null });
   },
 
-  // Pagination actions (prepared for future infinite scroll)
+  // Pagination actions (keyset cursor from the API)
   loadMorePosts: async (): Promise<void> => {
-    const { page, hasMore, isLoading } = get();
+    const { page, hasMore, isLoading, nextCursor } = get();
     
     if (isLoading || !hasMore) return;
     
     set({ isLoading: true });
     
     try {
-      const { posts: newPosts, hasMore: moreAvailable } = 
-        await postsService.getPostsPaginated(page + 1);
+      const { items: newPosts, next_cursor } = 
+        await postsService.getPostsPage(nextCursor);
       
       const { posts: currentPosts } = get();
       
       set({
         posts: [...currentPosts, ...newPosts],
         page: page + 1,
-        hasMore: moreAvailable,
+        hasMore: next_cursor !== null,
+        nextCursor: next_cursor,
         isLoading: false,
         error: null,
       });
@@ -200,6 +215,7 @@ export const usePostsStore = create<PostsStore>((set, get) => ({
     set({
       page: 1,
       hasMore: true,
+      nextCursor: null,
     });
   },
 
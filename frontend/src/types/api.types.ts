@@ -69,11 +69,18 @@ export interface PostResponse {
   description: string;
   created_at: string; // ISO 8601 datetime
   updated_at: string | null; // ISO 8601 datetime or null
+  version: number; // bumped on every edit
   author: UserSummary;
 }
 
+export interface PostPage {
+  items: PostResponse[];
+  next_cursor: string | null;
+}
+
 export interface CreatePostRequest {
   description: string;
+  version?: number; // edits only: reject if the post changed since this version
 }
 
 // API Client Types
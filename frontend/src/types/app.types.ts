@@ -16,4 +16,5 @@ export interface PostsState {
   error: string | null;
   hasMore: boolean;
   page: number;
+  nextCursor: string | null;
 }
\ No newline at end of file
@@ -3,6 +3,7 @@ export type {
   UserSummary,
   UserResponse,
   PostResponse,
+  PostPage,
   LoginResponse,
   TokenResponse,
   SignUpRequest,